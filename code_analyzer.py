@@ -6,20 +6,168 @@ Analisa todo o código do projeto, detecta erros e gera relatórios detalhados
 
 import os
 import json
+import argparse
 import re
-import ast
 import subprocess
 import datetime
+import mmap
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 
+# Decodificadores JSON opcionais, mais rápidos que o módulo json da stdlib
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Diretórios que nunca são percorridos durante a varredura de fontes; são
+# podados pelo nome antes da descida, sem listar o conteúdo
+PRUNE_DIRS = frozenset({
+    'node_modules', 'venv', '.venv', '.git', '__pycache__', 'dist', 'build', '.next'
+})
+
+# Extensões de arquivo tratadas como JavaScript/TypeScript
+JS_TS_EXTENSIONS = ('js', 'ts', 'tsx', 'jsx')
+
+# Abaixo deste número de arquivos a análise roda no próprio processo,
+# pois o custo de subir o pool supera o ganho do paralelismo
+PARALLEL_MIN_FILES = 128
+PARALLEL_CHUNKSIZE = 64
+
+# Cache de resultados por arquivo, invalidado por (mtime_ns, tamanho).
+# Incrementar CACHE_VERSION sempre que as regras de análise mudarem.
+CACHE_FILE = '.code_analyzer_cache.json'
+CACHE_VERSION = 4
+
+# Arquivos maiores que STREAM_THRESHOLD (em geral bundles gerados) são lidos em
+# blocos; ocorrências mais longas que STREAM_OVERLAP na divisa de dois blocos
+# podem não ser contadas
+STREAM_THRESHOLD = 4 << 20
+STREAM_BLOCK_SIZE = 1 << 20
+STREAM_OVERLAP = 64 << 10
+
+# Arquivos entre MMAP_THRESHOLD e STREAM_THRESHOLD são mapeados em memória e
+# varridos diretamente no page cache, sem cópia para um objeto bytes
+MMAP_THRESHOLD = 1 << 20
+
+# Tamanho do buffer de escrita do relatório (1 MiB)
+REPORT_BUFFER_SIZE = 1 << 20
+
+# Threads usadas no modo em processo para sobrepor leituras de disco ao processamento
+IO_WORKERS = 8
+
+# Mensagens são guardadas como (código, caminho, extra) e só viram texto no relatório
+Message = Tuple[str, Any, Any]
+
+MESSAGES = {
+    'DIR_MISSING': "Diretório obrigatório não encontrado: {path}",
+    'DIR_FOUND': "Diretório encontrado: {path}",
+    'DIR_UNREADABLE': "Diretório não pôde ser lido: {path}: {extra}",
+    'CONFIG_FOUND': "Arquivo de configuração encontrado: {path}",
+    'CONFIG_MISSING': "Arquivo de configuração não encontrado: {path}",
+    'ANALYZE_ERROR': "Erro ao analisar {path}: {extra}",
+    'READ_ERROR': "Erro ao ler {path}: {extra}",
+    'CONSOLE_LOG': "{path}: console.log encontrado (remover em produção)",
+    'TODO': "{path}:{extra[0]}: {extra[1]}",
+    'UNUSED_IMPORT': "{path}: Import possivelmente não utilizado: {extra}",
+    'PY_SYNTAX_OK': "Sintaxe Python válida: {path}",
+    'PY_SYNTAX': "Erro de sintaxe Python em {path}: {extra}",
+    'PY_ERROR': "Erro ao analisar Python {path}: {extra}",
+    'DEPS': "{path} - Dependências: {extra}",
+    'DEV_DEPS': "{path} - Dev Dependencies: {extra}",
+    'SCRIPT_MISSING': "{path} - Script obrigatório não encontrado: {extra}",
+    'ROUTES_FOUND': "Rotas encontradas em {path}: {extra}",
+    'ROUTE': "  {extra} {path}",
+    'NO_ROUTES': "Nenhuma rota encontrada em {path}",
+    'ROUTE_ERROR': "Erro ao analisar rota {path}: {extra}",
+    'SQL_FOUND': "Arquivos SQL encontrados: {extra}",
+    'SQL_FILE': "  {path}",
+    'NO_SQL': "Nenhum arquivo SQL encontrado",
+}
+
+# Mensagens incluídas no relatório apenas no modo verboso
+VERBOSE_ONLY = frozenset({'PY_SYNTAX_OK'})
+
+if msgspec is not None:
+    class PackageManifest(msgspec.Struct):
+        """Campos do package.json usados na análise; os demais são ignorados"""
+        dependencies: dict = {}
+        devDependencies: dict = {}
+        scripts: dict = {}
+
+def parse_package_json(content: bytes) -> Tuple[dict, dict, dict]:
+    """Decodifica um package.json, devolvendo (dependencies, devDependencies, scripts)"""
+    if msgspec is not None:
+        manifest = msgspec.json.decode(content, type=PackageManifest)
+        return manifest.dependencies, manifest.devDependencies, manifest.scripts
+    package_data = orjson.loads(content) if orjson is not None else json.loads(content)
+    return (
+        package_data.get('dependencies', {}),
+        package_data.get('devDependencies', {}),
+        package_data.get('scripts', {})
+    )
+
+def format_message(message: Message) -> str:
+    """Converte uma mensagem (código, caminho, extra) no texto do relatório"""
+    code, path, extra = message
+    return MESSAGES[code].format(path=path, extra=extra)
+
+@dataclass
+class FileAnalysis:
+    """Resultado da análise de um único arquivo, mesclado pelo processo principal"""
+    stats: Dict[str, int] = field(default_factory=dict)
+    errors: List[Message] = field(default_factory=list)
+    warnings: List[Message] = field(default_factory=list)
+    info: List[Message] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FileAnalysis':
+        """Reconstrói um resultado lido do cache JSON (listas voltam a ser tuplas)"""
+        return cls(
+            stats=data['stats'],
+            errors=[tuple(m) for m in data['errors']],
+            warnings=[tuple(m) for m in data['warnings']],
+            info=[tuple(m) for m in data['info']],
+        )
+
+def _analyze_one_file(file_path: str) -> FileAnalysis:
+    """Ponto de entrada dos processos worker (precisa ser nível de módulo)"""
+    if file_path.endswith('.py'):
+        return CodeAnalyzer._analyze_python_file(file_path)
+    return CodeAnalyzer._analyze_js_ts_file(file_path)
+
 class CodeAnalyzer:
-    def __init__(self, project_root: str):
+    # Padrões compilados uma única vez e compartilhados por todas as instâncias.
+    # Os padrões de JS/TS operam sobre bytes para evitar decodificar os arquivos.
+    _IMPORT_RE = re.compile(rb'import\s+.*?from\s+[\'"]([^\'"]+)[\'"]')
+    _FUNC_RE = re.compile(rb'(?:function\s+(\w+)|const\s+(\w+)\s*=.*?=>|(\w+)\s*:\s*\([^)]*\)\s*=>)')
+    _CLASS_RE = re.compile(rb'class\s+(\w+)')
+    _BRACE_IMPORT_RE = re.compile(rb'import\s+\{([^}]+)\}')
+    _IDENT_RE = re.compile(rb'[A-Za-z_$][A-Za-z0-9_$]*')
+    _ROUTE_RE = re.compile(r'router\.(get|post|put|delete|patch)\s*\([\'"]([^\'"]+)[\'"]')
+    # Linhas inteiras contendo TODO/FIXME, localizadas em uma única varredura
+    _TODO_RE = re.compile(rb'^[^\n]*(?:TODO|FIXME)[^\n]*', re.MULTILINE)
+
+    def __init__(self, project_root: str, use_cache: bool = True, verbose: bool = False):
         self.project_root = Path(project_root)
+        self.use_cache = use_cache
+        self.verbose = verbose
+        self.cache_path = self.project_root / CACHE_FILE
+        self._cache = {}
+        self._new_cache = {}
         self.errors = []
         self.warnings = []
         self.info = []
+        self._source_files = None
+        self._config_contents = {}
         self.stats = {
             'total_files': 0,
             'js_files': 0,
@@ -34,6 +182,8 @@ class CodeAnalyzer:
             'classes_found': 0,
             'imports_found': 0
         }
+        # Rótulos do relatório calculados uma vez ("total_files" -> "Total Files")
+        self.stat_labels = {key: key.replace('_', ' ').title() for key in self.stats}
         
         # Configurar logging
         logging.basicConfig(
@@ -41,10 +191,18 @@ class CodeAnalyzer:
             format='%(asctime)s - %(levelname)s - %(message)s'
         )
         self.logger = logging.getLogger(__name__)
+        self._info_on = True
 
     def analyze_project(self):
         """Análise completa do projeto"""
-        self.logger.info("Iniciando análise completa do projeto TVBOX3...")
+        # Nível verificado uma vez por análise; as mensagens de fase só são
+        # montadas e despachadas quando INFO está habilitado
+        self._info_on = self.logger.isEnabledFor(logging.INFO)
+        if self._info_on:
+            self.logger.info("Iniciando análise completa do projeto TVBOX3...")
+        
+        if self.use_cache:
+            self._load_cache()
         
         # Analisar estrutura do projeto
         self._analyze_project_structure()
@@ -67,12 +225,16 @@ class CodeAnalyzer:
         # Verificar banco de dados
         self._analyze_database_structure()
         
+        if self.use_cache:
+            self._save_cache()
+        
         # Gerar relatório
         self._generate_report()
 
     def _analyze_project_structure(self):
         """Analisa a estrutura do projeto"""
-        self.logger.info("Analisando estrutura do projeto...")
+        if self._info_on:
+            self.logger.info("Analisando estrutura do projeto...")
         
         required_dirs = [
             'src', 'backend', 'backend/routes', 'backend/config',
@@ -82,13 +244,14 @@ class CodeAnalyzer:
         for dir_path in required_dirs:
             full_path = self.project_root / dir_path
             if not full_path.exists():
-                self.errors.append(f"Diretório obrigatório não encontrado: {dir_path}")
+                self.errors.append(('DIR_MISSING', dir_path, None))
             else:
-                self.info.append(f"Diretório encontrado: {dir_path}")
+                self.info.append(('DIR_FOUND', dir_path, None))
 
     def _analyze_config_files(self):
         """Analisa arquivos de configuração"""
-        self.logger.info("Analisando arquivos de configuração...")
+        if self._info_on:
+            self.logger.info("Analisando arquivos de configuração...")
         
         config_files = [
             'package.json', 'vite.config.ts', 'tsconfig.json',
@@ -98,147 +261,369 @@ class CodeAnalyzer:
         for config_file in config_files:
             file_path = self.project_root / config_file
             if file_path.exists():
-                self.info.append(f"Arquivo de configuração encontrado: {config_file}")
-                self._analyze_file_content(file_path)
+                self.info.append(('CONFIG_FOUND', config_file, None))
+                content = self._analyze_file_content(file_path)
+                if content is not None and config_file.endswith('package.json'):
+                    # Reaproveitado por _analyze_dependencies sem reabrir o arquivo
+                    self._config_contents[config_file] = content
             else:
-                self.warnings.append(f"Arquivo de configuração não encontrado: {config_file}")
+                self.warnings.append(('CONFIG_MISSING', config_file, None))
+
+    def _iter_source_files(self):
+        """Percorre o projeto com os.scandir, podando diretórios ignorados"""
+        stack = [str(self.project_root)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name in PRUNE_DIRS:
+                                continue
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            yield entry
+            except OSError as e:
+                self.warnings.append(('DIR_UNREADABLE', e.filename, e.strerror))
+
+    def _get_source_files(self) -> Dict[str, List[str]]:
+        """Agrupa os arquivos do projeto por extensão (uma única varredura)"""
+        if self._source_files is None:
+            self._source_files = {}
+            for entry in self._iter_source_files():
+                ext = entry.name.rpartition('.')[2]
+                self._source_files.setdefault(ext, []).append(entry.path)
+        return self._source_files
 
     def _analyze_js_ts_files(self):
         """Analisa arquivos JavaScript/TypeScript"""
-        self.logger.info("Analisando arquivos JS/TS...")
+        if self._info_on:
+            self.logger.info("Analisando arquivos JS/TS...")
         
-        patterns = ['**/*.js', '**/*.ts', '**/*.tsx', '**/*.jsx']
+        source_files = self._get_source_files()
         
-        for pattern in patterns:
-            for file_path in self.project_root.glob(pattern):
-                if 'node_modules' in str(file_path):
-                    continue
-                    
+        paths = []
+        for ext in JS_TS_EXTENSIONS:
+            for file_path in source_files.get(ext, ()):
                 self.stats['total_files'] += 1
                 
-                if file_path.suffix == '.js':
+                if ext == 'js':
                     self.stats['js_files'] += 1
-                elif file_path.suffix == '.ts':
+                elif ext == 'ts':
                     self.stats['ts_files'] += 1
-                elif file_path.suffix == '.tsx':
+                elif ext == 'tsx':
                     self.stats['tsx_files'] += 1
                 
-                self._analyze_js_ts_file(file_path)
+                paths.append(file_path)
+        
+        for result in self._analyze_files(paths):
+            self._merge_result(result)
 
-    def _analyze_js_ts_file(self, file_path: Path):
+    def _load_cache(self):
+        """Carrega o cache de resultados da execução anterior, se existir"""
+        try:
+            data = json.loads(self.cache_path.read_bytes())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self.logger.warning("Cache ignorado (%s): %s", self.cache_path, e)
+            return
+        if isinstance(data, dict) and data.get('version') == CACHE_VERSION:
+            self._cache = data.get('files', {})
+
+    def _save_cache(self):
+        """Persiste o cache apenas com os arquivos vistos nesta execução"""
+        data = {'version': CACHE_VERSION, 'files': self._new_cache}
+        try:
+            self.cache_path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+        except OSError as e:
+            self.logger.warning("Não foi possível salvar o cache %s: %s", self.cache_path, e)
+
+    def _analyze_files(self, paths: List[str]) -> List[FileAnalysis]:
+        """Analisa os arquivos, reaproveitando resultados em cache de arquivos inalterados"""
+        if not self.use_cache:
+            return self._map_files(_analyze_one_file, paths)
+        
+        results = [None] * len(paths)
+        keys = {}
+        pending = []
+        for i, file_path in enumerate(paths):
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                pending.append(i)
+                continue
+            key = f"{st.st_mtime_ns}:{st.st_size}"
+            keys[i] = key
+            cached = self._cache.get(file_path)
+            if cached is not None and cached.get('key') == key:
+                results[i] = FileAnalysis.from_dict(cached['result'])
+                self._new_cache[file_path] = cached
+            else:
+                pending.append(i)
+        
+        fresh = self._map_files(_analyze_one_file, [paths[i] for i in pending])
+        for i, result in zip(pending, fresh):
+            results[i] = result
+            # Resultados com erro não entram no cache e são reavaliados na próxima execução
+            if i in keys and not result.errors:
+                self._new_cache[paths[i]] = {'key': keys[i], 'result': asdict(result)}
+        return results
+
+    def _map_files(self, func, paths: List[str]):
+        """Aplica func a cada arquivo, em paralelo quando há arquivos suficientes"""
+        if len(paths) < PARALLEL_MIN_FILES:
+            # A leitura dos arquivos libera o GIL, então as threads mantêm
+            # os próximos arquivos sendo lidos enquanto o atual é analisado
+            with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+                return list(executor.map(func, paths))
+        with ProcessPoolExecutor() as executor:
+            return list(executor.map(func, paths, chunksize=PARALLEL_CHUNKSIZE))
+
+    def _merge_result(self, result: FileAnalysis):
+        """Incorpora o resultado de um arquivo às estatísticas e mensagens"""
+        for key, value in result.stats.items():
+            self.stats[key] += value
+        self.errors.extend(result.errors)
+        self.warnings.extend(result.warnings)
+        if self.verbose:
+            self.info.extend(result.info)
+        else:
+            self.info.extend(m for m in result.info if m[0] not in VERBOSE_ONLY)
+
+    @classmethod
+    def _analyze_js_ts_file(cls, file_path: str) -> FileAnalysis:
         """Analisa um arquivo JS/TS específico"""
+        result = FileAnalysis()
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                lines = content.split('\n')
-                self.stats['total_lines'] += len(lines)
-                
-                # Verificar imports
-                imports = re.findall(r'import\s+.*?from\s+[\'"]([^\'"]+)[\'"]', content)
-                self.stats['imports_found'] += len(imports)
-                
-                # Verificar funções
-                functions = re.findall(r'(?:function\s+(\w+)|const\s+(\w+)\s*=.*?=>|(\w+)\s*:\s*\([^)]*\)\s*=>)', content)
-                self.stats['functions_found'] += len(functions)
-                
-                # Verificar classes
-                classes = re.findall(r'class\s+(\w+)', content)
-                self.stats['classes_found'] += len(classes)
-                
-                # Verificar erros comuns
-                self._check_common_js_errors(file_path, content, lines)
+            with open(file_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size > STREAM_THRESHOLD:
+                    cls._scan_js_ts_stream(result, file_path, f)
+                elif size > MMAP_THRESHOLD:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                            mm.madvise(mmap.MADV_SEQUENTIAL)
+                        # mmap não tem count(): conta as linhas bloco a bloco
+                        result.stats['total_lines'] = 1 + sum(
+                            mm[i:i + STREAM_BLOCK_SIZE].count(b'\n')
+                            for i in range(0, size, STREAM_BLOCK_SIZE)
+                        )
+                        cls._scan_js_ts_content(result, file_path, mm)
+                else:
+                    content = f.read()
+                    result.stats['total_lines'] = content.count(b'\n') + 1
+                    cls._scan_js_ts_content(result, file_path, content)
                 
         except Exception as e:
-            self.errors.append(f"Erro ao analisar {file_path}: {str(e)}")
+            result.errors.append(('ANALYZE_ERROR', file_path, str(e)))
+        return result
+
+    @classmethod
+    def _scan_js_ts_content(cls, result: FileAnalysis, file_path: str, content):
+        """Conta imports, funções e classes em um buffer (bytes ou mmap)"""
+        # Cada regex só roda se o literal que ela exige aparece no arquivo:
+        # find() é uma busca em C, bem mais barata que a varredura da regex
+        has_import = content.find(b'import') != -1
+        
+        # Verificar imports
+        if has_import and content.find(b'from') != -1:
+            result.stats['imports_found'] = len(cls._IMPORT_RE.findall(content))
+        else:
+            result.stats['imports_found'] = 0
+        
+        # Verificar funções
+        if content.find(b'function') != -1 or content.find(b'=>') != -1:
+            result.stats['functions_found'] = len(cls._FUNC_RE.findall(content))
+        else:
+            result.stats['functions_found'] = 0
+        
+        # Verificar classes
+        if content.find(b'class') != -1:
+            result.stats['classes_found'] = len(cls._CLASS_RE.findall(content))
+        else:
+            result.stats['classes_found'] = 0
+        
+        # Verificar erros comuns
+        cls._check_common_js_errors(result, file_path, content, has_import)
 
-    def _check_common_js_errors(self, file_path: Path, content: str, lines: List[str]):
+    @classmethod
+    def _scan_js_ts_stream(cls, result: FileAnalysis, file_path: str, f):
+        """Varre um arquivo JS/TS grande em blocos, sem carregá-lo inteiro na memória.
+        
+        Cada padrão retoma a busca de onde parou; só contam as ocorrências que
+        terminam antes da janela final do buffer, que é reaproveitada no bloco
+        seguinte. A verificação de imports não utilizados precisa do arquivo
+        inteiro e por isso não é feita neste modo.
+        """
+        counters = {
+            'imports_found': cls._IMPORT_RE,
+            'functions_found': cls._FUNC_RE,
+            'classes_found': cls._CLASS_RE,
+            'todo': cls._TODO_RE
+        }
+        counts = dict.fromkeys(counters, 0)
+        starts = dict.fromkeys(counters, 0)
+        total_lines = 1
+        lines_before = 0  # quebras de linha anteriores a buf[0]
+        has_console_log = False
+        buf = b''
+        
+        while True:
+            block = f.read(STREAM_BLOCK_SIZE)
+            final = not block
+            total_lines += block.count(b'\n')
+            buf += block
+            limit = len(buf) if final else len(buf) - STREAM_OVERLAP
+            
+            for key, pattern in counters.items():
+                pos = starts[key]
+                line_no, last_pos = lines_before + 1, 0
+                for match in pattern.finditer(buf, pos):
+                    if match.end() > limit:
+                        break
+                    pos = match.end()
+                    counts[key] += 1
+                    if key == 'todo':
+                        line_no += buf.count(b'\n', last_pos, match.start())
+                        last_pos = match.start()
+                        line = match.group().strip().decode('utf-8', 'replace')
+                        result.warnings.append(('TODO', file_path, (line_no, line)))
+                # Tentativas que começam antes da janela já enxergaram dados suficientes
+                starts[key] = max(pos, limit - STREAM_OVERLAP)
+            
+            if not has_console_log and b'console.log' in buf:
+                has_console_log = True
+            
+            if final:
+                break
+            
+            cut = max(0, min(starts.values()))
+            lines_before += buf.count(b'\n', 0, cut)
+            buf = buf[cut:]
+            for key in starts:
+                starts[key] -= cut
+        
+        result.stats['total_lines'] = total_lines
+        for key in ('imports_found', 'functions_found', 'classes_found'):
+            result.stats[key] = counts[key]
+        if has_console_log:
+            result.warnings.insert(0, ('CONSOLE_LOG', file_path, None))
+
+    @classmethod
+    def _check_common_js_errors(cls, result: FileAnalysis, file_path: str, content: bytes,
+                                has_import: bool = True):
         """Verifica erros comuns em JS/TS"""
         
-        # Verificar console.log em produção
-        if 'console.log' in content:
-            self.warnings.append(f"{file_path}: console.log encontrado (remover em produção)")
+        # Verificar console.log em produção (find funciona também em mmap)
+        if content.find(b'console.log') != -1:
+            result.warnings.append(('CONSOLE_LOG', file_path, None))
         
         # Verificar TODO/FIXME
-        for i, line in enumerate(lines, 1):
-            if 'TODO' in line or 'FIXME' in line:
-                self.warnings.append(f"{file_path}:{i}: {line.strip()}")
+        if content.find(b'TODO') != -1 or content.find(b'FIXME') != -1:
+            line_no, last_pos = 1, 0
+            for match in cls._TODO_RE.finditer(content):
+                # Fatia em vez de count(..., start, end) para aceitar também mmap
+                line_no += content[last_pos:match.start()].count(b'\n')
+                last_pos = match.start()
+                line = match.group().strip().decode('utf-8', 'replace')
+                result.warnings.append(('TODO', file_path, (line_no, line)))
         
         # Verificar imports não utilizados (básico)
-        imports = re.findall(r'import\s+\{([^}]+)\}', content)
+        # Os identificadores são coletados uma única vez, fora das cláusulas de import
+        if not has_import:
+            return
+        imports = []
+        used = set()
+        last_pos = 0
+        for match in cls._BRACE_IMPORT_RE.finditer(content):
+            used.update(cls._IDENT_RE.findall(content, last_pos, match.start()))
+            last_pos = match.end()
+            imports.append(match.group(1))
+        if not imports:
+            return
+        used.update(cls._IDENT_RE.findall(content, last_pos))
+        
         for import_match in imports:
-            imported_items = [item.strip() for item in import_match.split(',')]
-            for item in imported_items:
-                if item not in content.replace(f'import {{ {import_match} }}', ''):
-                    self.warnings.append(f"{file_path}: Import possivelmente não utilizado: {item}")
+            for item in import_match.split(b','):
+                # "a as b" e "type T": o nome local é sempre o último token
+                tokens = item.split()
+                if tokens and tokens[-1] not in used:
+                    item_name = item.strip().decode('utf-8', 'replace')
+                    result.warnings.append(('UNUSED_IMPORT', file_path, item_name))
 
     def _analyze_python_files(self):
         """Analisa arquivos Python"""
-        self.logger.info("Analisando arquivos Python...")
+        if self._info_on:
+            self.logger.info("Analisando arquivos Python...")
         
-        for file_path in self.project_root.glob('**/*.py'):
-            if 'venv' in str(file_path) or '__pycache__' in str(file_path):
-                continue
-                
-            self.stats['py_files'] += 1
-            self._analyze_python_file(file_path)
+        paths = self._get_source_files().get('py', [])
+        self.stats['py_files'] += len(paths)
+        
+        for result in self._analyze_files(paths):
+            self._merge_result(result)
 
-    def _analyze_python_file(self, file_path: Path):
+    @staticmethod
+    def _analyze_python_file(file_path: str) -> FileAnalysis:
         """Analisa um arquivo Python específico"""
+        result = FileAnalysis()
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # compile decodifica os bytes respeitando a declaração de encoding (PEP 263)
+            content = Path(file_path).read_bytes()
                 
             # Verificar sintaxe Python
             try:
-                ast.parse(content)
-                self.info.append(f"Sintaxe Python válida: {file_path}")
+                # Compila direto para bytecode (descartado): detecta os mesmos erros
+                # de sintaxe sem construir a árvore AST
+                compile(content, file_path, 'exec', dont_inherit=True, optimize=2)
+                result.info.append(('PY_SYNTAX_OK', file_path, None))
             except SyntaxError as e:
-                self.errors.append(f"Erro de sintaxe Python em {file_path}: {str(e)}")
+                result.errors.append(('PY_SYNTAX', file_path, str(e)))
                 
         except Exception as e:
-            self.errors.append(f"Erro ao analisar Python {file_path}: {str(e)}")
+            result.errors.append(('PY_ERROR', file_path, str(e)))
+        return result
 
     def _analyze_dependencies(self):
         """Analisa dependências do projeto"""
-        self.logger.info("Analisando dependências...")
+        if self._info_on:
+            self.logger.info("Analisando dependências...")
         
-        # Frontend dependencies
-        frontend_package = self.project_root / 'package.json'
-        if frontend_package.exists():
-            self._check_package_json(frontend_package, "Frontend")
+        packages = [
+            ('package.json', "Frontend"),
+            ('backend/package.json', "Backend")
+        ]
         
-        # Backend dependencies
-        backend_package = self.project_root / 'backend' / 'package.json'
-        if backend_package.exists():
-            self._check_package_json(backend_package, "Backend")
+        for package_file, context in packages:
+            package_path = self.project_root / package_file
+            content = self._config_contents.get(package_file)
+            if content is not None or package_path.exists():
+                self._check_package_json(package_path, context, content)
 
-    def _check_package_json(self, package_path: Path, context: str):
-        """Verifica package.json"""
+    def _check_package_json(self, package_path: Path, context: str, content: Optional[bytes] = None):
+        """Verifica package.json (content, se informado, evita reler o arquivo)"""
         try:
-            with open(package_path, 'r', encoding='utf-8') as f:
-                package_data = json.load(f)
+            if content is None:
+                content = package_path.read_bytes()
+            deps, dev_deps, scripts = parse_package_json(content)
             
             # Verificar dependências
-            deps = package_data.get('dependencies', {})
-            dev_deps = package_data.get('devDependencies', {})
-            
-            self.info.append(f"{context} - Dependências: {len(deps)}")
-            self.info.append(f"{context} - Dev Dependencies: {len(dev_deps)}")
+            self.info.append(('DEPS', context, len(deps)))
+            self.info.append(('DEV_DEPS', context, len(dev_deps)))
             
             # Verificar scripts
-            scripts = package_data.get('scripts', {})
             required_scripts = ['start', 'build']
             
             for script in required_scripts:
                 if script not in scripts:
-                    self.warnings.append(f"{context} - Script obrigatório não encontrado: {script}")
+                    self.warnings.append(('SCRIPT_MISSING', context, script))
                     
         except Exception as e:
-            self.errors.append(f"Erro ao analisar {package_path}: {str(e)}")
+            self.errors.append(('ANALYZE_ERROR', package_path, str(e)))
 
     def _analyze_routes_apis(self):
         """Analisa rotas e APIs"""
-        self.logger.info("Analisando rotas e APIs...")
+        if self._info_on:
+            self.logger.info("Analisando rotas e APIs...")
         
         routes_dir = self.project_root / 'backend' / 'routes'
         if routes_dir.exists():
@@ -251,95 +636,114 @@ class CodeAnalyzer:
             with open(route_file, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            # Verificar rotas definidas
-            routes = re.findall(r'router\.(get|post|put|delete|patch)\s*\([\'"]([^\'"]+)[\'"]', content)
+            # Verificar rotas definidas; o cabeçalho com o total entra antes
+            # delas, depois que todas foram percorridas
+            routes = [
+                ('ROUTE', match.group(2), match.group(1).upper())
+                for match in self._ROUTE_RE.finditer(content)
+            ]
             
             if routes:
-                self.info.append(f"Rotas encontradas em {route_file.name}: {len(routes)}")
-                for method, path in routes:
-                    self.info.append(f"  {method.upper()} {path}")
+                self.info.append(('ROUTES_FOUND', route_file.name, len(routes)))
+                self.info.extend(routes)
             else:
-                self.warnings.append(f"Nenhuma rota encontrada em {route_file.name}")
+                self.warnings.append(('NO_ROUTES', route_file.name, None))
                 
         except Exception as e:
-            self.errors.append(f"Erro ao analisar rota {route_file}: {str(e)}")
+            self.errors.append(('ROUTE_ERROR', route_file, str(e)))
 
     def _analyze_database_structure(self):
         """Analisa estrutura do banco de dados"""
-        self.logger.info("Analisando estrutura do banco...")
+        if self._info_on:
+            self.logger.info("Analisando estrutura do banco...")
         
         # Verificar arquivos SQL
-        sql_files = list(self.project_root.glob('**/*.sql'))
+        sql_files = self._get_source_files().get('sql', [])
         if sql_files:
-            self.info.append(f"Arquivos SQL encontrados: {len(sql_files)}")
+            self.info.append(('SQL_FOUND', None, len(sql_files)))
             for sql_file in sql_files:
-                self.info.append(f"  {sql_file}")
+                self.info.append(('SQL_FILE', sql_file, None))
         else:
-            self.warnings.append("Nenhum arquivo SQL encontrado")
+            self.warnings.append(('NO_SQL', None, None))
 
-    def _analyze_file_content(self, file_path: Path):
-        """Analisa conteúdo de arquivo genérico"""
+    def _analyze_file_content(self, file_path: Path) -> Optional[bytes]:
+        """Analisa conteúdo de arquivo genérico e devolve os bytes lidos"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                lines = len(content.split('\n'))
-                self.stats['total_lines'] += lines
+            content = file_path.read_bytes()
+            self.stats['total_lines'] += content.count(b'\n') + 1
+            return content
                 
         except Exception as e:
-            self.errors.append(f"Erro ao ler {file_path}: {str(e)}")
+            self.errors.append(('READ_ERROR', file_path, str(e)))
+            return None
 
     def _generate_report(self):
         """Gera relatório completo"""
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = datetime.datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         report_file = self.project_root / f"code_analysis_report_{timestamp}.txt"
         
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write("=" * 80 + "\n")
-            f.write("RELATÓRIO DE ANÁLISE DE CÓDIGO - TVBOX3\n")
-            f.write("=" * 80 + "\n")
-            f.write(f"Data/Hora: {datetime.datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
-            f.write(f"Projeto: {self.project_root}\n\n")
-            
-            # Estatísticas
-            f.write("ESTATÍSTICAS DO PROJETO\n")
-            f.write("-" * 40 + "\n")
-            for key, value in self.stats.items():
-                f.write(f"{key.replace('_', ' ').title()}: {value}\n")
-            f.write("\n")
-            
-            # Erros
-            f.write("ERROS ENCONTRADOS\n")
-            f.write("-" * 40 + "\n")
-            if self.errors:
-                for i, error in enumerate(self.errors, 1):
-                    f.write(f"{i}. {error}\n")
-            else:
-                f.write("Nenhum erro encontrado!\n")
-            f.write("\n")
-            
-            # Avisos
-            f.write("AVISOS E MELHORIAS\n")
-            f.write("-" * 40 + "\n")
-            if self.warnings:
-                for i, warning in enumerate(self.warnings, 1):
-                    f.write(f"{i}. {warning}\n")
-            else:
-                f.write("Nenhum aviso!\n")
-            f.write("\n")
-            
-            # Informações
-            f.write("INFORMAÇÕES GERAIS\n")
-            f.write("-" * 40 + "\n")
-            for info in self.info:
-                f.write(f"• {info}\n")
+        parts = []
+        ap = parts.append
+        ap("=" * 80 + "\n")
+        ap("RELATÓRIO DE ANÁLISE DE CÓDIGO - TVBOX3\n")
+        ap("=" * 80 + "\n")
+        ap(f"Data/Hora: {now.strftime('%d/%m/%Y %H:%M:%S')}\n")
+        ap(f"Projeto: {self.project_root}\n\n")
+        
+        # Estatísticas
+        ap("ESTATÍSTICAS DO PROJETO\n")
+        ap("-" * 40 + "\n")
+        labels = self.stat_labels
+        for key, value in self.stats.items():
+            ap(f"{labels[key]}: {value}\n")
+        ap("\n")
+        
+        # Erros
+        ap("ERROS ENCONTRADOS\n")
+        ap("-" * 40 + "\n")
+        if self.errors:
+            for i, error in enumerate(self.errors, 1):
+                ap(f"{i}. {format_message(error)}\n")
+        else:
+            ap("Nenhum erro encontrado!\n")
+        ap("\n")
         
-        self.logger.info(f"Relatório gerado: {report_file}")
+        # Avisos
+        ap("AVISOS E MELHORIAS\n")
+        ap("-" * 40 + "\n")
+        if self.warnings:
+            for i, warning in enumerate(self.warnings, 1):
+                ap(f"{i}. {format_message(warning)}\n")
+        else:
+            ap("Nenhum aviso!\n")
+        ap("\n")
+        
+        # Informações
+        ap("INFORMAÇÕES GERAIS\n")
+        ap("-" * 40 + "\n")
+        for info in self.info:
+            ap(f"• {format_message(info)}\n")
+        
+        # Relatório montado em memória e gravado de uma só vez
+        with open(report_file, 'w', encoding='utf-8', buffering=REPORT_BUFFER_SIZE) as f:
+            f.writelines(parts)
+        
+        if self._info_on:
+            self.logger.info("Relatório gerado: %s", report_file)
         return report_file
 
 def main():
     """Função principal"""
+    parser = argparse.ArgumentParser(description="Analisador de código do TVBOX3")
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f"reanalisa todos os arquivos, ignorando {CACHE_FILE}")
+    parser.add_argument('--verbose', action='store_true',
+                        help="inclui no relatório as verificações bem-sucedidas por arquivo")
+    args = parser.parse_args()
+    
     project_root = os.path.dirname(os.path.abspath(__file__))
-    analyzer = CodeAnalyzer(project_root)
+    analyzer = CodeAnalyzer(project_root, use_cache=not args.no_cache, verbose=args.verbose)
     analyzer.analyze_project()
     
     print("\n" + "=" * 60)
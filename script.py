@@ -8,6 +8,26 @@ PROJECT_BASE_PATH = r"c:\xampp\htdocs\TVBOX3"
 VALIDATION_JS_PATH = os.path.join(PROJECT_BASE_PATH, "backend", "middleware", "validation.js")
 DEVICES_JS_PATH = os.path.join(PROJECT_BASE_PATH, "backend", "routes", "devices.js")
 
+def _encode_snippet(snippet, content):
+    """
+    Codifica o trecho em UTF-8 usando a mesma quebra de linha do arquivo
+    (os arquivos são lidos em modo binário, sem conversão de CRLF).
+    """
+    data = snippet.encode('utf-8')
+    if b"\r\n" in content:
+        data = data.replace(b"\n", b"\r\n")
+    return data
+
+def _replace_once(content, old, new):
+    """
+    Substitui a primeira ocorrência de old por new com uma única busca.
+    Retorna None se o trecho não for encontrado.
+    """
+    idx = content.find(old)
+    if idx < 0:
+        return None
+    return content[:idx] + new + content[idx + len(old):]
+
 def patch_validation_file():
     """
     Altera a regra de validação do device_uuid de .required() para .optional()
@@ -15,7 +35,7 @@ def patch_validation_file():
     """
     print(f"🔄 Modificando {VALIDATION_JS_PATH}...")
     try:
-        with open(VALIDATION_JS_PATH, 'r', encoding='utf-8') as f:
+        with open(VALIDATION_JS_PATH, 'rb') as f:
             content = f.read()
 
         # Define o trecho de código a ser substituído
@@ -31,14 +51,14 @@ def patch_validation_file():
             "      .optional()"
         )
 
-        if old_code not in content:
+        # Substitui o código (uma única busca) e salva o arquivo
+        new_content = _replace_once(content, _encode_snippet(old_code, content), _encode_snippet(new_code, content))
+
+        if new_content is None:
             print("⚠️  A regra 'device_uuid' já parece ter sido alterada ou não foi encontrada. Pulando.")
             return
-
-        # Substitui o código e salva o arquivo
-        new_content = content.replace(old_code, new_code)
         
-        with open(VALIDATION_JS_PATH, 'w', encoding='utf-8') as f:
+        with open(VALIDATION_JS_PATH, 'wb') as f:
             f.write(new_content)
             
         print("✅  Arquivo de validação ('validation.js') atualizado com sucesso!")
@@ -56,25 +76,23 @@ def patch_devices_route_file():
     """
     print(f"🔄 Modificando {DEVICES_JS_PATH}...")
     try:
-        with open(DEVICES_JS_PATH, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        with open(DEVICES_JS_PATH, 'rb') as f:
+            content = f.read()
 
         # --- 1. Adicionar importação do uuid ---
-        import_line_index = -1
-        for i, line in enumerate(lines):
-            if "import express from 'express';" in line:
-                import_line_index = i
-                break
+        import_idx = content.find(b"import express from 'express';")
         
-        if import_line_index != -1 and "import { v4 as uuidv4 } from 'uuid';" not in "".join(lines):
-            lines.insert(import_line_index + 1, "import { v4 as uuidv4 } from 'uuid';\n")
+        if import_idx != -1 and content.find(b"import { v4 as uuidv4 } from 'uuid';") == -1:
+            # Insere logo após a linha do import do express
+            line_end = content.find(b"\n", import_idx)
+            insert_at = len(content) if line_end == -1 else line_end + 1
+            uuid_import = _encode_snippet("import { v4 as uuidv4 } from 'uuid';\n", content)
+            content = content[:insert_at] + uuid_import + content[insert_at:]
             print("   - Importação 'uuid' adicionada.")
         else:
             print("   - Importação 'uuid' já existe ou ponto de inserção não encontrado. Pulando.")
 
         # --- 2. Modificar a lógica da rota de registro ---
-        content = "".join(lines)
-        
         old_logic = (
             "const { name, model, tenant_id, device_uuid } = req.body;"
         )
@@ -84,14 +102,15 @@ def patch_devices_route_file():
             "    const device_uuid = req.body.device_uuid || uuidv4();"
         )
 
-        if old_logic in content:
-            content = content.replace(old_logic, new_logic)
+        patched = _replace_once(content, _encode_snippet(old_logic, content), _encode_snippet(new_logic, content))
+        if patched is not None:
+            content = patched
             print("   - Lógica de geração de UUID na rota de registro aplicada.")
         else:
             print("   - Lógica da rota já parece ter sido alterada ou não foi encontrada. Pulando.")
         
         # Salva o arquivo final
-        with open(DEVICES_JS_PATH, 'w', encoding='utf-8') as f:
+        with open(DEVICES_JS_PATH, 'wb') as f:
             f.write(content)
             
         print("✅  Arquivo de rotas ('devices.js') atualizado com sucesso!")
@@ -4,35 +4,141 @@ TVBOX3 - Script de Inicialização Completa
 Inicia todo o sistema TVBOX3 com verificações e monitoramento
 """
 
+import atexit
 import os
 import sys
 import subprocess
+import selectors
+import shutil
+import signal
 import time
 import json
-import requests
+import queue
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Optional
+from urllib.parse import urlsplit
 import logging
+import logging.handlers
+
+# Plataforma e flags de criação de processo, resolvidas uma vez na carga do módulo.
+# CREATE_NEW_CONSOLE só existe no subprocess do Windows.
+_IS_WINDOWS = os.name == 'nt'
+_CREATION_FLAGS = getattr(subprocess, 'CREATE_NEW_CONSOLE', 0) if _IS_WINDOWS else 0
+
+# Endereços verificados no health check de cada serviço
+SERVICE_URLS = {
+    'backend': 'http://localhost:3001',
+    'frontend': 'http://localhost:5173'
+}
+
+# Espera ativa pela inicialização: tempo máximo e intervalo entre consultas (s)
+READY_TIMEOUT = 30
+READY_POLL_INTERVAL = 0.1
+
+# Arquivos que precisam existir na raiz do projeto
+REQUIRED_PROJECT_FILES = (
+    'package.json',
+    'backend/package.json',
+    'backend/server.js',
+    'vite.config.ts'
+)
+
+# Diretórios de dependências instaladas (frontend e backend)
+NODE_MODULES_DIRS = ('node_modules', 'backend/node_modules')
+
+# Resultado da última verificação de pré-requisitos, reaproveitado enquanto os
+# executáveis e os mtimes dos arquivos/diretórios verificados não mudarem
+PRECHECK_CACHE_FILE = '.tvbox_precheck_cache.json'
+
+# Prazo (s) para os serviços encerrarem após o SIGTERM antes do SIGKILL
+STOP_TIMEOUT = 10
+
+# Diretório (relativo à raiz) dos arquivos <serviço>.log com stdout/stderr dos serviços
+SERVICE_LOG_DIR = 'logs'
+
+# Conteúdo padrão dos arquivos .env criados quando ainda não existem
+FRONTEND_ENV = """# Frontend Environment Variables
+VITE_API_URL=http://localhost:3001/api
+VITE_WS_URL=http://localhost:3001
+VITE_UPLOAD_URL=http://localhost:3001/uploads
+VITE_NODE_ENV=development
+VITE_WS_RECONNECT_INTERVAL=5000
+VITE_WS_MAX_RETRIES=10
+VITE_UPLOAD_MAX_SIZE=100
+VITE_UPLOAD_ALLOWED_TYPES=video/*,image/*
+VITE_CACHE_ENABLED=true
+VITE_CACHE_MAX_AGE=3600000
+"""
+
+BACKEND_ENV = """# Backend Environment Variables
+PORT=3001
+NODE_ENV=development
+DB_PATH=./tvbox.db
+JWT_SECRET=your-secret-key-here
+UPLOAD_DIR=./uploads
+MAX_FILE_SIZE=104857600
+CORS_ORIGIN=http://localhost:5173
+"""
 
 class TVBoxStarter:
     def __init__(self, project_root: str):
         self.project_root = Path(project_root)
         self.processes = {}
         self.services_status = {}
+        # Entradas (passou, nome_da_verificação); o texto só é montado se for exibido
         self.startup_log = []
         
+        # Executáveis resolvidos uma vez: dispensa shell=True (um cmd.exe a menos
+        # no Windows) e a busca no PATH a cada processo iniciado
+        self._node = shutil.which('node')
+        self._npm = shutil.which('npm.cmd' if _IS_WINDOWS else 'npm')
+        
+        # Uma conexão HTTP persistente por URL: keep-alive reaproveita o socket
+        # entre as consultas de prontidão, o health check e o monitoramento
+        self._connections = {}
+        
+        # Sinalizado por stop_system antes de encerrar os serviços: a partir daí o
+        # término dos processos é esperado e o monitor não o trata como falha
+        self._stopping = threading.Event()
+        
         # Configurar logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('startup.log', encoding='utf-8'),
-                logging.StreamHandler()
-            ]
-        )
+        self._log_listener = self._setup_logging()
         self.logger = logging.getLogger(__name__)
 
+    def _setup_logging(self) -> Optional[logging.handlers.QueueListener]:
+        """Configura o logging com a escrita em arquivo/console numa thread própria"""
+        root = logging.getLogger()
+        if root.handlers:
+            # Mesmo comportamento do basicConfig: não reconfigura se já houver handlers
+            return None
+        
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        # delay=True: startup.log só é aberto no primeiro registro
+        handlers = [
+            logging.FileHandler('startup.log', encoding='utf-8', delay=True),
+            logging.StreamHandler()
+        ]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        
+        # Quem loga só enfileira o registro; o I/O fica com a thread do listener
+        log_queue = queue.SimpleQueue()
+        root.setLevel(logging.INFO)
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+        listener = logging.handlers.QueueListener(log_queue, *handlers)
+        listener.start()
+        # Garante que a fila seja esvaziada mesmo quando stop_system não roda
+        atexit.register(self._stop_logging)
+        return listener
+
+    def _stop_logging(self):
+        """Esvazia a fila de logging e encerra a thread do listener"""
+        listener, self._log_listener = self._log_listener, None
+        if listener is not None:
+            listener.stop()
+
     def start_system(self):
         """Inicia o sistema completo"""
         self.logger.info("=" * 60)
@@ -67,44 +173,89 @@ class TVBoxStarter:
         """Verifica pré-requisitos do sistema"""
         self.logger.info("Verificando pré-requisitos...")
         
+        # Cada verificação devolve um bool, ou uma tupla quando cobre vários nomes
         checks = {
-            'node_installed': self._check_node(),
-            'npm_installed': self._check_npm(),
-            'python_installed': self._check_python(),
-            'project_structure': self._check_project_structure(),
-            'dependencies': self._check_dependencies()
+            ('node_installed', 'npm_installed'): self._check_node_npm,
+            ('python_installed',): self._check_python,
+            ('project_structure',): self._check_project_structure,
+            ('dependencies',): self._check_dependencies
         }
         
+        # Nada mudou desde a última execução bem-sucedida: pula node/npm e os stats
+        cache_key = self._precheck_cache_key()
+        if cache_key is not None and self._load_precheck_cache() == cache_key:
+            self.logger.info("[OK] Pré-requisitos inalterados desde a última verificação")
+            self.startup_log.extend((True, check_name) for names in checks for check_name in names)
+            return True
+        
+        # As verificações são independentes (subprocessos e stat), então rodam
+        # em paralelo e o tempo total passa a ser o da mais lenta
         all_passed = True
-        for check_name, passed in checks.items():
-            if passed:
-                self.logger.info(f"[OK] {check_name}")
-                self.startup_log.append(f"PASS: {check_name}")
-            else:
-                self.logger.error(f"[ERRO] {check_name}")
-                self.startup_log.append(f"FAIL: {check_name}")
-                all_passed = False
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            futures = {executor.submit(check): names for names, check in checks.items()}
+            for future in as_completed(futures):
+                results = future.result()
+                if not isinstance(results, tuple):
+                    results = (results,)
+                for check_name, passed in zip(futures[future], results):
+                    self.startup_log.append((passed, check_name))
+                    if passed:
+                        self.logger.info(f"[OK] {check_name}")
+                    else:
+                        self.logger.error(f"[ERRO] {check_name}")
+                        all_passed = False
         
+        if cache_key is not None:
+            self._save_precheck_cache(cache_key, all_passed)
         return all_passed
 
-    def _check_node(self):
-        """Verifica se Node.js está instalado"""
+    def _precheck_cache_key(self) -> Optional[list]:
+        """Chave do cache: executáveis resolvidos e mtimes do que é verificado"""
         try:
-            result = subprocess.run(['node', '--version'], 
-                                  capture_output=True, text=True, timeout=10, shell=True)
-            return result.returncode == 0
-        except Exception as e:
-            self.logger.debug(f"Erro ao verificar node: {e}")
-            return False
+            mtimes = [
+                os.stat(self.project_root / path).st_mtime_ns
+                for path in (*REQUIRED_PROJECT_FILES, *NODE_MODULES_DIRS)
+            ]
+        except OSError:
+            # Algo está faltando: a verificação completa vai apontar o quê
+            return None
+        return [self._node, self._npm, *mtimes]
+
+    def _load_precheck_cache(self) -> Optional[list]:
+        """Retorna a chave da última verificação bem-sucedida, se houver"""
+        try:
+            data = json.loads((self.project_root / PRECHECK_CACHE_FILE).read_bytes())
+        except (OSError, ValueError):
+            return None
+        if isinstance(data, dict) and data.get('result') is True:
+            return data.get('key')
+        return None
+
+    def _save_precheck_cache(self, cache_key: list, result: bool):
+        """Persiste o resultado da verificação junto com a chave usada"""
+        try:
+            (self.project_root / PRECHECK_CACHE_FILE).write_text(
+                json.dumps({'key': cache_key, 'result': result}), encoding='utf-8')
+        except OSError as e:
+            self.logger.warning(f"Não foi possível salvar {PRECHECK_CACHE_FILE}: {e}")
+
+    def _check_node_npm(self):
+        """Verifica se Node.js e npm estão instalados, retornando (node, npm)"""
+        # Sem node o npm não roda: nesse caso nem vale a pena disparar o segundo processo
+        node_ok = self._run_version_check(self._node)
+        npm_ok = node_ok and self._run_version_check(self._npm)
+        return node_ok, npm_ok
 
-    def _check_npm(self):
-        """Verifica se npm está instalado"""
+    def _run_version_check(self, executable: Optional[str]) -> bool:
+        """Executa `<executable> --version` e informa se terminou com sucesso"""
+        if executable is None:
+            return False
         try:
-            result = subprocess.run(['npm', '--version'], 
-                                  capture_output=True, text=True, timeout=10, shell=True)
+            result = subprocess.run([executable, '--version'], 
+                                  capture_output=True, text=True, timeout=5)
             return result.returncode == 0
         except Exception as e:
-            self.logger.debug(f"Erro ao verificar npm: {e}")
+            self.logger.debug(f"Erro ao verificar {executable}: {e}")
             return False
 
     def _check_python(self):
@@ -116,25 +267,35 @@ class TVBoxStarter:
 
     def _check_project_structure(self):
         """Verifica estrutura do projeto"""
-        required_files = [
-            'package.json',
-            'backend/package.json',
-            'backend/server.js',
-            'vite.config.ts'
-        ]
+        # Uma listagem por diretório pai em vez de um stat por arquivo
+        by_parent = {}
+        for file_path in REQUIRED_PROJECT_FILES:
+            parent, _, name = file_path.rpartition('/')
+            by_parent.setdefault(parent, set()).add(name)
         
-        for file_path in required_files:
-            if not (self.project_root / file_path).exists():
+        for parent, names in by_parent.items():
+            try:
+                with os.scandir(self.project_root / parent) as it:
+                    present = {entry.name for entry in it}
+            except OSError:
+                return False
+            if not names <= present:
                 return False
         return True
 
     def _check_dependencies(self):
         """Verifica se dependências estão instaladas"""
-        # Verificar node_modules do frontend
-        frontend_deps = self.project_root / 'node_modules'
-        backend_deps = self.project_root / 'backend' / 'node_modules'
-        
-        return frontend_deps.exists() and backend_deps.exists()
+        # Verificar node_modules do frontend e do backend
+        return all(self._dir_has_entries(self.project_root / path) for path in NODE_MODULES_DIRS)
+
+    @staticmethod
+    def _dir_has_entries(path: Path) -> bool:
+        """Verifica se o diretório existe e não está vazio, lendo só a primeira entrada"""
+        try:
+            with os.scandir(path) as it:
+                return next(it, None) is not None
+        except OSError:
+            return False
 
     def _prepare_environment(self):
         """Prepara ambiente para execução"""
@@ -151,37 +312,29 @@ class TVBoxStarter:
 
     def _ensure_env_files(self):
         """Garante que arquivos .env existem"""
-        frontend_env = self.project_root / '.env'
-        backend_env = self.project_root / 'backend' / '.env'
+        env_files = [
+            ('frontend', self.project_root / '.env', FRONTEND_ENV),
+            ('backend', self.project_root / 'backend' / '.env', BACKEND_ENV)
+        ]
         
-        if not frontend_env.exists():
-            self.logger.info("Criando arquivo .env do frontend...")
-            with open(frontend_env, 'w') as f:
-                f.write("""# Frontend Environment Variables
-VITE_API_URL=http://localhost:3001/api
-VITE_WS_URL=http://localhost:3001
-VITE_UPLOAD_URL=http://localhost:3001/uploads
-VITE_NODE_ENV=development
-VITE_WS_RECONNECT_INTERVAL=5000
-VITE_WS_MAX_RETRIES=10
-VITE_UPLOAD_MAX_SIZE=100
-VITE_UPLOAD_ALLOWED_TYPES=video/*,image/*
-VITE_CACHE_ENABLED=true
-VITE_CACHE_MAX_AGE=3600000
-""")
+        missing = []
+        for label, env_path, content in env_files:
+            if not env_path.exists():
+                self.logger.info(f"Criando arquivo .env do {label}...")
+                missing.append((env_path, content))
         
-        if not backend_env.exists():
-            self.logger.info("Criando arquivo .env do backend...")
-            with open(backend_env, 'w') as f:
-                f.write("""# Backend Environment Variables
-PORT=3001
-NODE_ENV=development
-DB_PATH=./tvbox.db
-JWT_SECRET=your-secret-key-here
-UPLOAD_DIR=./uploads
-MAX_FILE_SIZE=104857600
-CORS_ORIGIN=http://localhost:5173
-""")
+        # As escritas são independentes e só fazem syscalls: rodam em paralelo
+        if len(missing) > 1:
+            with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+                list(executor.map(lambda item: self._write_env_file(*item), missing))
+        else:
+            for env_path, content in missing:
+                self._write_env_file(env_path, content)
+
+    @staticmethod
+    def _write_env_file(env_path: Path, content: str):
+        """Grava o arquivo .env de uma vez"""
+        env_path.write_text(content, encoding='utf-8')
 
     def _ensure_directories(self):
         """Garante que diretórios necessários existem"""
@@ -191,11 +344,15 @@ CORS_ORIGIN=http://localhost:5173
             'logs'
         ]
         
+        # mkdir direto, sem exists() antes: FileExistsError indica que já existia,
+        # e os pais só são tocados quando o próprio diretório está faltando
         for dir_path in directories:
             full_path = self.project_root / dir_path
-            if not full_path.exists():
-                self.logger.info(f"Criando diretório: {dir_path}")
-                full_path.mkdir(parents=True, exist_ok=True)
+            try:
+                full_path.mkdir(parents=True)
+            except FileExistsError:
+                continue
+            self.logger.info(f"Criando diretório: {dir_path}")
 
     def _install_dependencies(self):
         """Instala dependências se necessário"""
@@ -203,13 +360,60 @@ CORS_ORIGIN=http://localhost:5173
         frontend_modules = self.project_root / 'node_modules'
         backend_modules = self.project_root / 'backend' / 'node_modules'
         
-        if not frontend_modules.exists() or not any(frontend_modules.iterdir()):
+        # Os dois diretórios são independentes: as instalações rodam em paralelo
+        targets = []
+        if not self._dir_has_entries(frontend_modules):
             self.logger.info("Instalando dependências do frontend...")
-            subprocess.run(['npm', 'install'], cwd=self.project_root, check=True)
+            targets.append(self.project_root)
         
-        if not backend_modules.exists() or not any(backend_modules.iterdir()):
+        if not self._dir_has_entries(backend_modules):
             self.logger.info("Instalando dependências do backend...")
-            subprocess.run(['npm', 'install'], cwd=self.project_root / 'backend', check=True)
+            targets.append(self.project_root / 'backend')
+        
+        installs = self._spawn_npm_installs(targets, use_ci=True)
+        
+        # Aguarda todas antes de reportar falha, para não deixar npm órfão
+        returncodes = [process.wait() for process in installs]
+        
+        # npm ci falha quando o package-lock.json está dessincronizado do
+        # package.json; nesse caso repete com npm install, que o atualiza
+        retry = [
+            cwd for cwd, process, returncode in zip(targets, installs, returncodes)
+            if returncode != 0 and process.args[1] == 'ci'
+        ]
+        for cwd in retry:
+            self.logger.warning(
+                f"npm ci falhou em {cwd} (package-lock.json dessincronizado?); tentando npm install"
+            )
+        retried = self._spawn_npm_installs(retry, use_ci=False)
+        retry_codes = [process.wait() for process in retried]
+        
+        results = dict(zip(targets, zip(installs, returncodes)))
+        results.update(zip(retry, zip(retried, retry_codes)))
+        for cwd, (process, returncode) in results.items():
+            if returncode != 0:
+                self.logger.error(f"Falha ao instalar dependências em {cwd} (npm {process.args[1]}, código {returncode})")
+                raise subprocess.CalledProcessError(returncode, process.args)
+
+    def _spawn_npm_installs(self, targets: List[Path], use_ci: bool) -> List[subprocess.Popen]:
+        """Dispara as instalações; se uma não puder ser iniciada, encerra as já iniciadas"""
+        started = []
+        try:
+            for cwd in targets:
+                started.append(self._spawn_npm_install(cwd, use_ci))
+        except Exception:
+            # Sem isso o npm já iniciado continuaria rodando sem ninguém esperar por ele
+            for process in started:
+                process.terminate()
+                process.wait()
+            raise
+        return started
+
+    def _spawn_npm_install(self, cwd: Path, use_ci: bool = True) -> subprocess.Popen:
+        """Dispara a instalação sem bloquear; usa npm ci quando há lockfile"""
+        # npm ci pula a resolução de dependências e é mais rápido que npm install
+        command = 'ci' if use_ci and (cwd / 'package-lock.json').exists() else 'install'
+        return subprocess.Popen([self._npm, command], cwd=cwd)
 
     def _start_services(self):
         """Inicia todos os serviços"""
@@ -219,28 +423,54 @@ CORS_ORIGIN=http://localhost:5173
         self._start_backend()
         
         # Aguardar backend inicializar
-        time.sleep(3)
+        self._wait_ready('backend')
         
         # Iniciar frontend
         self._start_frontend()
         
         # Aguardar frontend inicializar
-        time.sleep(5)
+        self._wait_ready('frontend')
+
+    def _wait_ready(self, service_name: str, timeout: float = READY_TIMEOUT,
+                    interval: float = READY_POLL_INTERVAL) -> bool:
+        """Consulta o serviço até ele responder, o processo morrer ou o tempo esgotar"""
+        process = self.processes.get(service_name)
+        if process is None:
+            return False
+        
+        url = SERVICE_URLS[service_name]
+        start = time.monotonic()
+        deadline = start + timeout
+        while True:
+            if self._check_service_health(url, timeout=1):
+                self.logger.info(f"Serviço {service_name} pronto em {time.monotonic() - start:.1f}s")
+                return True
+            if process.poll() is not None:
+                self.logger.error(f"Serviço {service_name} encerrou antes de ficar pronto")
+                return False
+            if time.monotonic() >= deadline:
+                self.logger.warning(f"Serviço {service_name} não respondeu em {timeout}s")
+                return False
+            time.sleep(interval)
 
     def _start_backend(self):
         """Inicia o servidor backend"""
         self.logger.info("Iniciando servidor backend...")
         
         try:
-            # Usar npm start no diretório backend
-            process = subprocess.Popen(
-                ['npm', 'start'],
-                cwd=self.project_root / 'backend',
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                creationflags=subprocess.CREATE_NEW_CONSOLE if os.name == 'nt' else 0
-            )
+            # Usar npm start no diretório backend. No POSIX o serviço ganha sessão
+            # própria (setsid), equivalente ao console separado do Windows: não
+            # recebe o Ctrl+C do terminal nem morre junto com este script. Sem
+            # preexec_fn, o _posixsubprocess usa vfork+exec em vez de fork.
+            with self._open_service_log('backend') as log_file:
+                process = subprocess.Popen(
+                    [self._npm, 'start'],
+                    cwd=self.project_root / 'backend',
+                    stdout=log_file,
+                    stderr=log_file,
+                    creationflags=_CREATION_FLAGS,
+                    start_new_session=True
+                )
             
             self.processes['backend'] = process
             self.services_status['backend'] = 'STARTING'
@@ -256,14 +486,15 @@ CORS_ORIGIN=http://localhost:5173
         
         try:
             # Usar npm run dev para o frontend
-            process = subprocess.Popen(
-                ['npm', 'run', 'dev'],
-                cwd=self.project_root,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                creationflags=subprocess.CREATE_NEW_CONSOLE if os.name == 'nt' else 0
-            )
+            with self._open_service_log('frontend') as log_file:
+                process = subprocess.Popen(
+                    [self._npm, 'run', 'dev'],
+                    cwd=self.project_root,
+                    stdout=log_file,
+                    stderr=log_file,
+                    creationflags=_CREATION_FLAGS,
+                    start_new_session=True
+                )
             
             self.processes['frontend'] = process
             self.services_status['frontend'] = 'STARTING'
@@ -273,38 +504,63 @@ CORS_ORIGIN=http://localhost:5173
             self.logger.error(f"Erro ao iniciar frontend: {str(e)}")
             self.services_status['frontend'] = 'ERROR'
 
+    def _open_service_log(self, service_name: str):
+        """Abre o log de saída do serviço em modo append, sem buffer do Python"""
+        # A saída vai direto para o arquivo: nada lia os PIPEs, e com o buffer
+        # do pipe cheio (64KB) o serviço travava no write. O filho herda o
+        # descritor, então o pai pode fechar sua cópia logo após o Popen.
+        log_dir = self.project_root / SERVICE_LOG_DIR
+        log_dir.mkdir(parents=True, exist_ok=True)
+        return open(log_dir / f'{service_name}.log', 'ab', buffering=0)
+
     def _health_check(self):
         """Verifica saúde dos serviços"""
         self.logger.info("Verificando saúde dos serviços...")
         
-        # Aguardar serviços iniciarem
-        time.sleep(10)
-        
-        # Verificar backend
-        backend_healthy = self._check_service_health('http://localhost:3001')
-        if backend_healthy:
-            self.services_status['backend'] = 'RUNNING'
-            self.logger.info("[OK] Backend está saudável")
-        else:
-            self.services_status['backend'] = 'UNHEALTHY'
-            self.logger.error("[ERRO] Backend não está respondendo")
-        
-        # Verificar frontend
-        frontend_healthy = self._check_service_health('http://localhost:5173')
-        if frontend_healthy:
-            self.services_status['frontend'] = 'RUNNING'
-            self.logger.info("[OK] Frontend está saudável")
-        else:
-            self.services_status['frontend'] = 'UNHEALTHY'
-            self.logger.error("[ERRO] Frontend não está respondendo")
+        # Os dois serviços são verificados em paralelo
+        with ThreadPoolExecutor(max_workers=len(SERVICE_URLS)) as executor:
+            futures = {
+                executor.submit(self._check_service_health, url): name
+                for name, url in SERVICE_URLS.items()
+            }
+            for future in as_completed(futures):
+                service_name = futures[future]
+                label = service_name.capitalize()
+                if future.result():
+                    self.services_status[service_name] = 'RUNNING'
+                    self.logger.info(f"[OK] {label} está saudável")
+                else:
+                    self.services_status[service_name] = 'UNHEALTHY'
+                    self.logger.error(f"[ERRO] {label} não está respondendo")
 
     def _check_service_health(self, url: str, timeout: int = 5) -> bool:
         """Verifica se um serviço está respondendo"""
-        try:
-            response = requests.get(url, timeout=timeout)
-            return response.status_code < 500
-        except:
-            return False
+        # Import tardio: http.client (e email.*) só pesa quando há serviço a consultar
+        from http.client import HTTPConnection, HTTPException
+        
+        if url not in self._connections:
+            parsed = urlsplit(url)
+            connection = HTTPConnection(parsed.hostname, parsed.port, timeout=timeout)
+            self._connections[url] = (connection, parsed.path or '/')
+        connection, path = self._connections[url]
+        
+        # Uma segunda tentativa só quando o socket reaproveitado já estava
+        # fechado pelo servidor (keep-alive expirado)
+        for _ in range(2):
+            reused = connection.sock is not None
+            connection.timeout = timeout
+            if reused:
+                connection.sock.settimeout(timeout)
+            try:
+                connection.request('GET', path)
+                response = connection.getresponse()
+                response.read()
+                return response.status < 500
+            except (OSError, HTTPException):
+                connection.close()
+                if not reused:
+                    return False
+        return False
 
     def _start_monitoring(self):
         """Inicia monitoramento dos serviços"""
@@ -319,14 +575,81 @@ CORS_ORIGIN=http://localhost:5173
 
     def _monitor_services(self):
         """Monitora serviços em background"""
-        while True:
+        # No Linux (3.9+, kernel 5.3+) cada processo vira um pidfd que fica
+        # legível quando ele termina: a thread dorme até um serviço cair
+        if hasattr(os, 'pidfd_open'):
+            try:
+                self._monitor_services_pidfd()
+                return
+            except OSError as e:
+                self.logger.debug(f"pidfd indisponível, usando verificação periódica: {e}")
+        
+        self._monitor_services_poll()
+
+    def _monitor_services_pidfd(self):
+        """Monitora serviços esperando o término de cada processo via pidfd"""
+        with selectors.DefaultSelector() as selector:
+            try:
+                for service_name, process in self.processes.items():
+                    fd = os.pidfd_open(process.pid)
+                    selector.register(fd, selectors.EVENT_READ, data=service_name)
+            except OSError:
+                for key in list(selector.get_map().values()):
+                    selector.unregister(key.fd)
+                    os.close(key.fd)
+                raise
+            
+            while selector.get_map():
+                for key, _ in selector.select():
+                    selector.unregister(key.fd)
+                    os.close(key.fd)
+                    self._mark_service_stopped(key.data)
+
+    def _monitor_services_poll(self):
+        """Monitora serviços verificando os processos periodicamente"""
+        pid_to_name = {process.pid: name for name, process in self.processes.items()}
+        while pid_to_name:
             time.sleep(30)  # Verificar a cada 30 segundos
             
             # Verificar se processos ainda estão rodando
-            for service_name, process in self.processes.items():
-                if process.poll() is not None:
-                    self.logger.warning(f"Serviço {service_name} parou inesperadamente")
-                    self.services_status[service_name] = 'STOPPED'
+            for service_name in self._collect_exited_services(pid_to_name):
+                self._mark_service_stopped(service_name)
+
+    def _collect_exited_services(self, pid_to_name: Dict[int, str]) -> List[str]:
+        """Remove de pid_to_name e retorna os serviços cujos processos terminaram"""
+        exited = []
+        
+        # waitid(P_ALL, WNOWAIT) aponta um filho encerrado sem consumi-lo: com
+        # todos rodando, o ciclo custa uma syscall em vez de um waitpid por serviço
+        if hasattr(os, 'waitid'):
+            while pid_to_name:
+                try:
+                    info = os.waitid(os.P_ALL, 0, os.WEXITED | os.WNOHANG | os.WNOWAIT)
+                except ChildProcessError:
+                    break
+                if info is None:
+                    return exited
+                service_name = pid_to_name.pop(info.si_pid, None)
+                if service_name is None:
+                    # Filho que não é serviço: com WNOWAIT ele continuaria sendo
+                    # o primeiro retornado, então o restante vai pelo poll()
+                    break
+                self.processes[service_name].wait()
+                exited.append(service_name)
+        
+        # Sem waitid (Windows/macOS) ou com outro filho pendente: poll() por serviço
+        for pid, service_name in list(pid_to_name.items()):
+            if self.processes[service_name].poll() is not None:
+                del pid_to_name[pid]
+                exited.append(service_name)
+        return exited
+
+    def _mark_service_stopped(self, service_name: str):
+        """Registra que um serviço parou"""
+        if self._stopping.is_set():
+            return
+        self.logger.warning(f"Serviço {service_name} parou inesperadamente")
+        self.services_status[service_name] = 'STOPPED'
 
     def _display_status(self):
         """Exibe status final do sistema"""
@@ -334,11 +657,17 @@ CORS_ORIGIN=http://localhost:5173
         self.logger.info("STATUS DO SISTEMA TVBOX3")
         self.logger.info("=" * 60)
         
+        # Conta os serviços rodando na mesma passada que exibe o status
+        running = 0
         for service, status in self.services_status.items():
-            status_icon = "[OK]" if status == 'RUNNING' else "[ERRO]"
+            if status == 'RUNNING':
+                running += 1
+                status_icon = "[OK]"
+            else:
+                status_icon = "[ERRO]"
             self.logger.info(f"{status_icon} {service.upper()}: {status}")
         
-        if all(status == 'RUNNING' for status in self.services_status.values()):
+        if running == len(self.services_status):
             self.logger.info("\n🎉 SISTEMA INICIADO COM SUCESSO!")
             self.logger.info("Frontend: http://localhost:5173")
             self.logger.info("Backend API: http://localhost:3001/api")
@@ -347,43 +676,83 @@ CORS_ORIGIN=http://localhost:5173
             self.logger.error("\n❌ ALGUNS SERVIÇOS FALHARAM AO INICIAR")
             self.logger.error("Verifique os logs para mais detalhes")
 
+    @staticmethod
+    def _signal_service(process: subprocess.Popen, force: bool = False):
+        """Encerra o serviço; no POSIX o sinal vai para o grupo inteiro do processo"""
+        if _IS_WINDOWS:
+            if force:
+                process.kill()
+            else:
+                process.terminate()
+            return
+        
+        # Com start_new_session o npm lidera o próprio grupo (pgid == pid), então
+        # killpg alcança também o node filho, que do contrário ficaria órfão
+        try:
+            os.killpg(process.pid, signal.SIGKILL if force else signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
     def stop_system(self):
         """Para todos os serviços"""
         self.logger.info("Parando sistema...")
+        self._stopping.set()
         
+        # Todos recebem o sinal antes de qualquer espera, e o prazo é compartilhado:
+        # o encerramento leva o tempo do serviço mais lento, não a soma
+        stopping = []
         for service_name, process in self.processes.items():
             if process.poll() is None:
                 self.logger.info(f"Parando {service_name}...")
-                process.terminate()
-                try:
-                    process.wait(timeout=10)
-                except subprocess.TimeoutExpired:
-                    process.kill()
+                self._signal_service(process)
+                stopping.append(process)
+        
+        deadline = time.monotonic() + STOP_TIMEOUT
+        for process in stopping:
+            try:
+                process.wait(timeout=max(0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                self._signal_service(process, force=True)
+                process.wait()
+        
+        for connection, _ in self._connections.values():
+            connection.close()
         
         self.logger.info("Sistema parado")
+        self._stop_logging()
 
 def main():
     """Função principal"""
     project_root = os.path.dirname(os.path.abspath(__file__))
     starter = TVBoxStarter(project_root)
     
+    # SIGTERM (kill, systemd) encerra pelo mesmo caminho do Ctrl+C
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+    
+    exit_code = 0
     try:
         if starter.start_system():
-            # Manter o script rodando
-            while True:
-                time.sleep(1)
+            # Manter o script rodando sem acordar a cada segundo. No Windows a
+            # espera sem timeout não é interrompida pelo Ctrl+C, então lá ela
+            # volta periodicamente para o interpretador tratar o sinal.
+            wait_timeout = 1 if _IS_WINDOWS else None
+            while not stop_event.wait(wait_timeout):
+                pass
+            print("\nParando sistema...")
         else:
             print("Falha na inicialização do sistema")
-            sys.exit(1)
+            exit_code = 1
             
     except KeyboardInterrupt:
         print("\nParando sistema...")
-        starter.stop_system()
-        sys.exit(0)
     except Exception as e:
         print(f"Erro inesperado: {str(e)}")
+        exit_code = 1
+    finally:
         starter.stop_system()
-        sys.exit(1)
+    
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
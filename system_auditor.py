@@ -4,21 +4,98 @@ TVBOX3 - Auditor de Sistema Completo
 Realiza auditoria completa do sistema, testa logins, funcionalidades e gera relatório detalhado
 """
 
+import argparse
 import os
 import json
 import requests
 import subprocess
 import datetime
 import time
+import socket
 import sqlite3
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import logging
+from requests.adapters import HTTPAdapter
+
+# Serializador JSON opcional, mais rápido que o módulo json da stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Limite de threads para as requisições HTTP independentes de cada fase
+MAX_PROBE_WORKERS = 16
+
+# Quantas requisições aparecem na seção "mais lentas" do relatório
+SLOWEST_PROBES = 10
+
+# Arquivos que precisam existir na raiz do projeto
+REQUIRED_FILES = (
+    'package.json',
+    'vite.config.ts',
+    'backend/package.json',
+    'backend/server.js',
+    '.env',
+    'backend/.env'
+)
+
+# REQUIRED_FILES agrupados pelo diretório pai: uma listagem por diretório
+REQUIRED_FILES_BY_PARENT = {}
+for _file_path in REQUIRED_FILES:
+    _parent, _, _name = _file_path.rpartition('/')
+    REQUIRED_FILES_BY_PARENT.setdefault(_parent, set()).add(_name)
+del _file_path, _parent, _name
+
+# Serviços testados, pela chave em base_urls
+SERVICES = ('frontend', 'backend', 'api')
+
+# Endpoints da API testados: (método, caminho, descrição)
+API_ENDPOINTS = (
+    ('GET', '/api/devices', 'Listar dispositivos'),
+    ('GET', '/api/announcements', 'Listar anúncios'),
+    ('POST', '/api/auth/login', 'Login de usuário'),
+    ('GET', '/api/system/status', 'Status do sistema')
+)
+
+# Cenários de login testados: (usuário, senha, descrição)
+LOGIN_CASES = (
+    ('admin', 'admin123', 'Login admin válido'),
+    ('user', 'user123', 'Login usuário válido'),
+    ('invalid', 'invalid', 'Login inválido'),
+    ('', '', 'Login vazio')
+)
+
+# Tabelas principais verificadas no banco; os nomes são interpolados no SQL,
+# por isso vêm só desta lista fixa
+TABLES_TO_CHECK = ('devices', 'device_files', 'announcements', 'users')
+
+# Porta do servidor WebSocket (a mesma do backend)
+WEBSOCKET_PORT = 3001
+
+# Diretórios importantes verificados no sistema de arquivos
+IMPORTANT_DIRS = (
+    'backend/uploads',
+    'backend/config',
+    'backend/routes',
+    'src/components',
+    'src/services'
+)
 
 class SystemAuditor:
-    def __init__(self, project_root: str):
+    # Endereço do WebSocket resolvido uma vez por processo (ver _websocket_address)
+    _websocket_addr: Optional[Tuple[str, int]] = None
+
+    def __init__(self, project_root: str, pretty: bool = False, use_cache: bool = True):
         self.project_root = Path(project_root)
-        self.audit_results = {
+        self.pretty = pretty
+        self.use_cache = use_cache
+        # Último relatório JSON do projeto, carregado em run_full_audit: estrutura e
+        # diretórios cujo mtime não mudou desde então não são listados de novo
+        self._previous: Dict[str, Any] = {}
+        self.audit_results: Dict[str, Any] = {
             'timestamp': datetime.datetime.now().isoformat(),
             'system_status': {},
             'login_tests': {},
@@ -38,97 +115,313 @@ class SystemAuditor:
             'api': 'http://localhost:3001/api'
         }
         
-        # Configurar logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
+        # Uma sessão com pool de conexões para todas as requisições da auditoria:
+        # keep-alive evita um novo handshake TCP por endpoint testado
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # Resultado de cada GET já feito na auditoria em andamento, por URL:
+        # endpoints consultados por mais de uma fase recebem uma requisição só
+        self._get_cache: Dict[str, Dict[str, Any]] = {}
+        
+        # Conexão SQLite aberta na primeira consulta e mantida até close(),
+        # com o cache de páginas quente entre as consultas
+        self._db: Optional[sqlite3.Connection] = None
+        
+        # Requisições da auditoria em andamento, registradas num SQLite em memória;
+        # o relatório ordena e agrega a partir daqui (ex.: as mais lentas)
+        self._probe_log = sqlite3.connect(':memory:', check_same_thread=False)
+        self._probe_log.execute(
+            "CREATE TABLE probes (method TEXT, url TEXT, status TEXT, elapsed REAL, detail TEXT)"
         )
+        
+        # O logging do processo é configurado em main(); instanciar vários
+        # auditores não o reconfigura
         self.logger = logging.getLogger(__name__)
+        self._info_on = True
 
     def run_full_audit(self):
         """Executa auditoria completa do sistema"""
-        self.logger.info("Iniciando auditoria completa do sistema TVBOX3...")
-        
-        # Verificar estrutura do sistema
-        self._audit_system_structure()
-        
-        # Testar serviços
-        self._audit_services()
-        
-        # Testar banco de dados
-        self._audit_database()
-        
-        # Testar APIs
-        self._audit_apis()
-        
-        # Testar sistema de login
-        self._audit_login_system()
-        
-        # Testar funcionalidades principais
-        self._audit_main_features()
-        
-        # Verificar arquivos e permissões
-        self._audit_file_system()
+        # Nível verificado uma vez por auditoria; as mensagens de fase só são
+        # despachadas quando INFO está habilitado
+        self._info_on = self.logger.isEnabledFor(logging.INFO)
+        if self._info_on:
+            self.logger.info("Iniciando auditoria completa do sistema TVBOX3...")
+        self._get_cache.clear()
+        self._probe_log.execute("DELETE FROM probes")
+        self._previous = self._load_previous_report() if self.use_cache else {}
+        
+        # Uma thread para cada uma das sete fases e uma para o lote HTTP
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            # Todas as requisições HTTP das fases saem num único lote concorrente;
+            # cada fase de rede recebe depois a sua fatia dos resultados
+            probes = executor.submit(self._probe_batches, {
+                'services': [job for _, job in self._service_targets()],
+                'apis': [job for _, job in self._api_targets()],
+                'login': [job for _, job in self._login_targets()],
+                'features': [job for _, job in self._feature_targets()]
+            })
+            
+            # As fases não dependem umas das outras: disco, banco e rede se sobrepõem.
+            # Cada uma devolve seus resultados, incorporados abaixo na ordem desta lista
+            phases = [
+                # Verificar estrutura do sistema
+                self._audit_system_structure,
+                # Testar serviços
+                lambda: self._audit_services(probes.result()['services']),
+                # Testar banco de dados
+                self._audit_database,
+                # Testar APIs
+                lambda: self._audit_apis(probes.result()['apis']),
+                # Testar sistema de login
+                lambda: self._audit_login_system(probes.result()['login']),
+                # Testar funcionalidades principais
+                lambda: self._audit_main_features(probes.result()['features']),
+                # Verificar arquivos e permissões
+                self._audit_file_system
+            ]
+            partials = list(executor.map(lambda phase: phase(), phases))
+        
+        for partial in partials:
+            self._merge_results(partial)
         
         # Gerar relatório final
         self._generate_audit_report()
 
+    def _load_previous_report(self) -> Dict[str, Any]:
+        """Carrega o relatório JSON mais recente do projeto ({} se não houver)"""
+        # O timestamp no nome (AAAAMMDD_HHMMSS) faz a ordem alfabética ser a cronológica
+        reports = sorted(self.project_root.glob('system_audit_report_*.json'))
+        if not reports:
+            return {}
+        try:
+            content = reports[-1].read_bytes()
+            return orjson.loads(content) if orjson is not None else json.loads(content)
+        except (OSError, ValueError):
+            return {}
+
+    def _phase_results(self) -> Dict[str, Any]:
+        """Resultados vazios de uma fase, no mesmo formato de audit_results"""
+        return {
+            'system_status': {},
+            'errors': [],
+            'warnings': [],
+            'success': []
+        }
+
+    def _merge_results(self, partial: Dict[str, Any]):
+        """Incorpora os resultados de uma fase em audit_results"""
+        for key, value in partial.items():
+            if isinstance(value, list):
+                self.audit_results[key].extend(value)
+            elif key == 'system_status':
+                self.audit_results[key].update(value)
+            else:
+                self.audit_results[key] = value
+
     def _audit_system_structure(self):
         """Audita estrutura do sistema"""
-        self.logger.info("Auditando estrutura do sistema...")
-        
-        required_files = [
-            'package.json',
-            'vite.config.ts',
-            'backend/package.json',
-            'backend/server.js',
-            '.env',
-            'backend/.env'
-        ]
+        if self._info_on:
+            self.logger.info("Auditando estrutura do sistema...")
+        partial = self._phase_results()
         
         structure_status = {}
+        parent_mtimes = {}
+        
+        previous = self._previous.get('system_status', {})
+        previous_status = previous.get('file_structure', {})
+        previous_mtimes = previous.get('file_structure_mtimes', {})
         
-        for file_path in required_files:
-            full_path = self.project_root / file_path
-            if full_path.exists():
+        # Uma listagem por diretório pai em vez de um stat por arquivo
+        present = set()
+        for parent, names in REQUIRED_FILES_BY_PARENT.items():
+            parent_path = self.project_root / parent
+            paths = [f"{parent}/{name}" if parent else name for name in names]
+            try:
+                mtime = parent_path.stat().st_mtime_ns
+            except OSError:
+                # Diretório pai ausente: todos os arquivos dele estão faltando
+                continue
+            parent_mtimes[parent] = mtime
+            
+            # Criar ou remover arquivos muda o mtime do diretório: se ele é o mesmo
+            # do relatório anterior, a existência de cada arquivo também é
+            if previous_mtimes.get(parent) == mtime and all(path in previous_status for path in paths):
+                present.update(path for path in paths if previous_status[path] == "OK")
+                continue
+            
+            try:
+                with os.scandir(parent_path) as it:
+                    found = names.intersection(entry.name for entry in it)
+            except OSError:
+                continue
+            present.update(f"{parent}/{name}" if parent else name for name in found)
+        
+        for file_path in REQUIRED_FILES:
+            if file_path in present:
                 structure_status[file_path] = "OK"
-                self.audit_results['success'].append(f"Arquivo encontrado: {file_path}")
+                partial['success'].append(f"Arquivo encontrado: {file_path}")
             else:
                 structure_status[file_path] = "MISSING"
-                self.audit_results['errors'].append(f"Arquivo obrigatório não encontrado: {file_path}")
+                partial['errors'].append(f"Arquivo obrigatório não encontrado: {file_path}")
         
-        self.audit_results['system_status']['file_structure'] = structure_status
+        partial['system_status']['file_structure'] = structure_status
+        partial['system_status']['file_structure_mtimes'] = parent_mtimes
+        return partial
+
+    def close(self):
+        """Libera os recursos abertos pela auditoria"""
+        self.session.close()
+        self._probe_log.close()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _database(self, db_path: Path) -> sqlite3.Connection:
+        """Conexão com o banco da auditoria, aberta e configurada uma única vez"""
+        if self._db is None:
+            # check_same_thread=False: as fases rodam em threads do executor
+            db = sqlite3.connect(str(db_path), check_same_thread=False)
+            # Ajustes só desta conexão; o arquivo do banco não é alterado
+            db.execute("PRAGMA query_only = ON")
+            db.execute("PRAGMA cache_size = -65536")
+            db.execute("PRAGMA temp_store = MEMORY")
+            self._db = db
+        return self._db
+
+    def _probe(self, method: str, url: str, json: Optional[Dict] = None) -> Dict[str, Any]:
+        """Executa uma requisição e devolve {'response': ...} ou {'error': nome_da_falha}"""
+        try:
+            if method != 'HEAD':
+                return {'response': self.session.request(method, url, json=json, timeout=5)}
+            
+            # Só o status interessa: HEAD não transfere o corpo (o index.html do
+            # frontend, por exemplo). Redirecionamentos são seguidos como no GET
+            response = self.session.head(url, timeout=5, allow_redirects=True)
+            if response.status_code in (405, 501):
+                # Servidor sem suporte a HEAD: GET lendo só os cabeçalhos
+                response = self.session.get(url, timeout=5, stream=True)
+                response.close()
+            return {'response': response}
+        except requests.exceptions.RequestException as e:
+            # Serviço fora do ar é o caso comum: o nome da exceção (ConnectionError,
+            # ReadTimeout...) basta e evita formatar a mensagem longa do urllib3
+            return {'error': e.__class__.__name__}
+
+    def _probe_all(self, jobs: List[Tuple[str, str, Optional[Dict]]]) -> List[Dict[str, Any]]:
+        """Executa as requisições (método, url, json) em paralelo, na ordem recebida"""
+        # GETs são identificados pela URL e feitos uma vez só; os demais métodos
+        # não são reaproveitados e ficam identificados pela posição
+        keys = [
+            (method, url if method == 'GET' else index)
+            for index, (method, url, _) in enumerate(jobs)
+        ]
+        pending = {}
+        for key, job in zip(keys, jobs):
+            if key not in pending and (key[0] != 'GET' or key[1] not in self._get_cache):
+                pending[key] = job
+        
+        fresh = {}
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(MAX_PROBE_WORKERS, len(pending))) as executor:
+                fresh = dict(zip(pending, executor.map(lambda job: self._probe(*job), pending.values())))
+            for key, result in fresh.items():
+                if key[0] == 'GET':
+                    self._get_cache[key[1]] = result
+            self._log_probes([(job, fresh[key]) for key, job in pending.items()])
+        
+        return [fresh[key] if key in fresh else self._get_cache[key[1]] for key in keys]
 
-    def _audit_services(self):
+    def _log_probes(self, probes: List[Tuple[Tuple[str, str, Optional[Dict]], Dict[str, Any]]]):
+        """Registra as requisições feitas e seus resultados na tabela probes"""
+        rows = []
+        for (method, url, _), result in probes:
+            response = result.get('response')
+            if response is None:
+                rows.append((method, url, 'ERROR', None, result['error']))
+            else:
+                rows.append((method, url, str(response.status_code), response.elapsed.total_seconds(), None))
+        self._probe_log.executemany("INSERT INTO probes VALUES (?, ?, ?, ?, ?)", rows)
+
+    def _probe_batches(self, batches: Dict[str, List[Tuple[str, str, Optional[Dict]]]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Executa os lotes nomeados numa única rodada concorrente e os separa de volta"""
+        results = self._probe_all([job for jobs in batches.values() for job in jobs])
+        split = {}
+        offset = 0
+        for name, jobs in batches.items():
+            split[name] = results[offset:offset + len(jobs)]
+            offset += len(jobs)
+        return split
+
+    def _service_targets(self) -> List[Tuple[str, Tuple[str, str, Optional[Dict]]]]:
+        """Serviços testados e a requisição de cada um"""
+        # Basta saber se o serviço responde: HEAD em vez de GET
+        return [(name, ('HEAD', self.base_urls[name], None)) for name in SERVICES]
+
+    def _api_targets(self) -> List[Tuple[Tuple[str, str, str], Tuple[str, str, Optional[Dict]]]]:
+        """Endpoints da API testados e a requisição de cada um"""
+        targets = []
+        for method, endpoint, description in API_ENDPOINTS:
+            # Para POST de login, usar dados de teste
+            body = None
+            if method == 'POST' and 'login' in endpoint:
+                body = {
+                    'username': 'test',
+                    'password': 'test'
+                }
+            targets.append(((method, endpoint, description), (method, f"{self.base_urls['backend']}{endpoint}", body)))
+        return targets
+
+    def _login_targets(self) -> List[Tuple[Tuple[str, str, str], Tuple[str, str, Optional[Dict]]]]:
+        """Cenários de login testados e a requisição de cada um"""
+        url = f"{self.base_urls['backend']}/api/auth/login"
+        return [
+            (case, ('POST', url, {'username': case[0], 'password': case[1]}))
+            for case in LOGIN_CASES
+        ]
+
+    def _feature_targets(self) -> List[Tuple[str, Tuple[str, str, Optional[Dict]]]]:
+        """Funcionalidades testadas por HTTP e a requisição de cada uma"""
+        return [
+            ('device_management', ('GET', f"{self.base_urls['api']}/devices", None)),
+            ('announcements', ('GET', f"{self.base_urls['api']}/announcements", None))
+        ]
+
+    def _audit_services(self, results: Optional[List[Dict[str, Any]]] = None):
         """Audita serviços em execução"""
-        self.logger.info("Auditando serviços...")
-        
-        services = {
-            'frontend': self.base_urls['frontend'],
-            'backend': self.base_urls['backend'],
-            'api': self.base_urls['api']
-        }
+        if self._info_on:
+            self.logger.info("Auditando serviços...")
+        partial = self._phase_results()
         
+        targets = self._service_targets()
         service_status = {}
         
-        for service_name, url in services.items():
-            try:
-                response = requests.get(url, timeout=5)
-                if response.status_code == 200:
-                    service_status[service_name] = "RUNNING"
-                    self.audit_results['success'].append(f"Serviço {service_name} está rodando")
-                else:
-                    service_status[service_name] = f"ERROR_{response.status_code}"
-                    self.audit_results['errors'].append(f"Serviço {service_name} retornou status {response.status_code}")
-            except requests.exceptions.RequestException as e:
+        # Requisições em paralelo; os resultados são registrados na ordem dos serviços
+        if results is None:
+            results = self._probe_all([job for _, job in targets])
+        
+        for (service_name, _), result in zip(targets, results):
+            response = result.get('response')
+            if response is None:
                 service_status[service_name] = "DOWN"
-                self.audit_results['errors'].append(f"Serviço {service_name} não está acessível: {str(e)}")
+                partial['errors'].append(f"Serviço {service_name} não está acessível: {result['error']}")
+            elif response.status_code == 200:
+                service_status[service_name] = "RUNNING"
+                partial['success'].append(f"Serviço {service_name} está rodando")
+            else:
+                service_status[service_name] = f"ERROR_{response.status_code}"
+                partial['errors'].append(f"Serviço {service_name} retornou status {response.status_code}")
         
-        self.audit_results['service_tests'] = service_status
+        partial['service_tests'] = service_status
+        return partial
 
     def _audit_database(self):
         """Audita banco de dados"""
-        self.logger.info("Auditando banco de dados...")
+        if self._info_on:
+            self.logger.info("Auditando banco de dados...")
+        partial = self._phase_results()
         
         db_tests = {}
         
@@ -136,184 +429,237 @@ class SystemAuditor:
         db_path = self.project_root / 'backend' / 'tvbox.db'
         if db_path.exists():
             db_tests['database_file'] = "EXISTS"
-            self.audit_results['success'].append("Arquivo de banco de dados encontrado")
+            partial['success'].append("Arquivo de banco de dados encontrado")
             
             try:
                 # Testar conexão
-                conn = sqlite3.connect(str(db_path))
-                cursor = conn.cursor()
+                db = self._database(db_path)
                 
                 # Verificar tabelas principais
-                tables_to_check = ['devices', 'device_files', 'announcements', 'users']
+                # Uma consulta para a existência de todas as tabelas (e da sqlite_stat1);
+                # o SQL de criação indica as tabelas WITHOUT ROWID
+                names = TABLES_TO_CHECK + ('sqlite_stat1',)
+                placeholders = ','.join('?' * len(names))
+                existing = dict(db.execute(
+                    f"SELECT name, sql FROM sqlite_master WHERE type='table' AND name IN ({placeholders})",
+                    names
+                ))
+                
+                # A auditoria só precisa de uma estimativa do número de registros, sem
+                # varrer as tabelas: primeiro o total gravado pelo último ANALYZE
+                # (primeiro número de sqlite_stat1.stat)...
+                counts = {}
+                if 'sqlite_stat1' in existing:
+                    for table, stat in db.execute(
+                        f"SELECT tbl, stat FROM sqlite_stat1 WHERE tbl IN ({placeholders})",
+                        names
+                    ):
+                        counts.setdefault(table, (int(stat.split()[0]), 'stat1'))
+                
+                for table in TABLES_TO_CHECK:
+                    if table in existing and table not in counts:
+                        counts[table] = self._estimate_rows(db, table, existing[table])
                 
-                for table in tables_to_check:
-                    cursor.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table}'")
-                    if cursor.fetchone():
+                for table in TABLES_TO_CHECK:
+                    if table in existing:
                         db_tests[f'table_{table}'] = "EXISTS"
-                        self.audit_results['success'].append(f"Tabela {table} encontrada")
+                        partial['success'].append(f"Tabela {table} encontrada")
                         
-                        # Contar registros
-                        cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                        count = cursor.fetchone()[0]
+                        # Registros e a origem do número: 'count' é exato, os demais
+                        # ('stat1', 'max_rowid') são estimativas
+                        count, source = counts[table]
                         db_tests[f'table_{table}_count'] = count
-                        self.audit_results['success'].append(f"Tabela {table} tem {count} registros")
+                        db_tests[f'table_{table}_count_source'] = source
+                        if source == 'count':
+                            partial['success'].append(f"Tabela {table} tem {count} registros")
+                        else:
+                            partial['success'].append(f"Tabela {table} tem aproximadamente {count} registros")
                     else:
                         db_tests[f'table_{table}'] = "MISSING"
-                        self.audit_results['errors'].append(f"Tabela {table} não encontrada")
+                        partial['errors'].append(f"Tabela {table} não encontrada")
                 
-                conn.close()
-                
-            except Exception as e:
+            except sqlite3.Error as e:
                 db_tests['connection'] = "ERROR"
-                self.audit_results['errors'].append(f"Erro ao conectar com banco: {str(e)}")
+                partial['errors'].append(f"Erro ao conectar com banco: {e}")
         else:
             db_tests['database_file'] = "MISSING"
-            self.audit_results['errors'].append("Arquivo de banco de dados não encontrado")
+            partial['errors'].append("Arquivo de banco de dados não encontrado")
         
-        self.audit_results['database_tests'] = db_tests
+        partial['database_tests'] = db_tests
+        return partial
+
+    @staticmethod
+    def _estimate_rows(db: sqlite3.Connection, table: str, create_sql: Optional[str]) -> Tuple[int, str]:
+        """Estima os registros de uma tabela sem estatística; devolve (número, origem)"""
+        # O maior ROWID sai descendo só a borda direita da b-tree, mas é uma marca
+        # d'água (ignora exclusões). Tabelas WITHOUT ROWID, ou em que a consulta
+        # falhe, são contadas com COUNT(*). O nome vem de TABLES_TO_CHECK
+        if 'WITHOUT ROWID' not in (create_sql or '').upper():
+            try:
+                return db.execute(f"SELECT COALESCE(MAX(_ROWID_), 0) FROM {table}").fetchone()[0], 'max_rowid'
+            except sqlite3.Error:
+                pass
+        return db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0], 'count'
 
-    def _audit_apis(self):
+    def _audit_apis(self, results: Optional[List[Dict[str, Any]]] = None):
         """Audita endpoints da API"""
-        self.logger.info("Auditando APIs...")
-        
-        api_endpoints = [
-            ('GET', '/api/devices', 'Listar dispositivos'),
-            ('GET', '/api/announcements', 'Listar anúncios'),
-            ('POST', '/api/auth/login', 'Login de usuário'),
-            ('GET', '/api/system/status', 'Status do sistema')
-        ]
+        if self._info_on:
+            self.logger.info("Auditando APIs...")
+        partial = self._phase_results()
         
+        targets = self._api_targets()
         api_tests = {}
         
-        for method, endpoint, description in api_endpoints:
+        if results is None:
+            results = self._probe_all([job for _, job in targets])
+        
+        for ((method, endpoint, description), _), result in zip(targets, results):
             test_key = f"{method}_{endpoint.replace('/', '_')}"
+            response = result.get('response')
             
-            try:
-                url = f"{self.base_urls['backend']}{endpoint}"
-                
-                if method == 'GET':
-                    response = requests.get(url, timeout=5)
-                elif method == 'POST':
-                    # Para POST de login, usar dados de teste
-                    if 'login' in endpoint:
-                        response = requests.post(url, json={
-                            'username': 'test',
-                            'password': 'test'
-                        }, timeout=5)
-                    else:
-                        response = requests.post(url, timeout=5)
-                
-                api_tests[test_key] = {
-                    'status_code': response.status_code,
-                    'description': description,
-                    'response_time': response.elapsed.total_seconds()
-                }
-                
-                if response.status_code < 500:
-                    self.audit_results['success'].append(f"API {description} respondeu (status: {response.status_code})")
-                else:
-                    self.audit_results['errors'].append(f"API {description} erro do servidor (status: {response.status_code})")
-                    
-            except requests.exceptions.RequestException as e:
+            if response is None:
                 api_tests[test_key] = {
                     'status_code': 'ERROR',
                     'description': description,
-                    'error': str(e)
+                    'error': result['error']
                 }
-                self.audit_results['errors'].append(f"API {description} não acessível: {str(e)}")
+                partial['errors'].append(f"API {description} não acessível: {result['error']}")
+                continue
+            
+            api_tests[test_key] = {
+                'status_code': response.status_code,
+                'description': description,
+                'response_time': response.elapsed.total_seconds()
+            }
+            
+            if response.status_code < 500:
+                partial['success'].append(f"API {description} respondeu (status: {response.status_code})")
+            else:
+                partial['errors'].append(f"API {description} erro do servidor (status: {response.status_code})")
         
-        self.audit_results['api_tests'] = api_tests
+        partial['api_tests'] = api_tests
+        return partial
 
-    def _audit_login_system(self):
+    def _audit_login_system(self, results: Optional[List[Dict[str, Any]]] = None):
         """Audita sistema de login"""
-        self.logger.info("Auditando sistema de login...")
+        if self._info_on:
+            self.logger.info("Auditando sistema de login...")
+        partial = self._phase_results()
         
+        targets = self._login_targets()
         login_tests = {}
         
-        # Testar diferentes cenários de login
-        test_cases = [
-            ('admin', 'admin123', 'Login admin válido'),
-            ('user', 'user123', 'Login usuário válido'),
-            ('invalid', 'invalid', 'Login inválido'),
-            ('', '', 'Login vazio')
-        ]
+        if results is None:
+            results = self._probe_all([job for _, job in targets])
         
-        for username, password, description in test_cases:
+        for ((username, password, description), _), result in zip(targets, results):
             test_key = f"login_{username or 'empty'}"
+            response = result.get('response')
             
-            try:
-                url = f"{self.base_urls['backend']}/api/auth/login"
-                response = requests.post(url, json={
-                    'username': username,
-                    'password': password
-                }, timeout=5)
-                
-                login_tests[test_key] = {
-                    'status_code': response.status_code,
-                    'description': description,
-                    'has_token': 'token' in response.text.lower()
-                }
-                
-                if response.status_code == 200:
-                    self.audit_results['success'].append(f"Login test: {description} - SUCCESS")
-                elif response.status_code == 401:
-                    self.audit_results['success'].append(f"Login test: {description} - CORRECTLY REJECTED")
-                else:
-                    self.audit_results['warnings'].append(f"Login test: {description} - UNEXPECTED STATUS {response.status_code}")
-                    
-            except requests.exceptions.RequestException as e:
+            if response is None:
                 login_tests[test_key] = {
                     'status_code': 'ERROR',
                     'description': description,
-                    'error': str(e)
+                    'error': result['error']
                 }
-                self.audit_results['errors'].append(f"Login test {description} falhou: {str(e)}")
+                partial['errors'].append(f"Login test {description} falhou: {result['error']}")
+                continue
+            
+            login_tests[test_key] = {
+                'status_code': response.status_code,
+                'description': description,
+                'has_token': self._has_token(response)
+            }
+            
+            if response.status_code == 200:
+                partial['success'].append(f"Login test: {description} - SUCCESS")
+            elif response.status_code == 401:
+                partial['success'].append(f"Login test: {description} - CORRECTLY REJECTED")
+            else:
+                partial['warnings'].append(f"Login test: {description} - UNEXPECTED STATUS {response.status_code}")
         
-        self.audit_results['login_tests'] = login_tests
+        partial['login_tests'] = login_tests
+        return partial
 
-    def _audit_main_features(self):
+    @staticmethod
+    def _has_token(response: requests.Response) -> bool:
+        """Verifica se a resposta de login traz um token (token, access_token...)"""
+        # Só corpos JSON são decodificados; a página HTML de um erro não é lida
+        if 'json' not in response.headers.get('Content-Type', ''):
+            return False
+        try:
+            body = response.json()
+        except ValueError:
+            return False
+        return isinstance(body, dict) and any('token' in key.lower() for key in body)
+
+    def _audit_main_features(self, results: Optional[List[Dict[str, Any]]] = None):
         """Audita funcionalidades principais"""
-        self.logger.info("Auditando funcionalidades principais...")
+        if self._info_on:
+            self.logger.info("Auditando funcionalidades principais...")
+        partial = self._phase_results()
+        
+        targets = self._feature_targets()
+        if results is None:
+            results = self._probe_all([job for _, job in targets])
+        probes = {name: result for (name, _), result in zip(targets, results)}
         
         features = {
-            'device_management': self._test_device_management,
+            'device_management': functools.partial(self._test_device_management, probes['device_management']),
             'file_upload': self._test_file_upload,
-            'announcements': self._test_announcements,
+            'announcements': functools.partial(self._test_announcements, probes['announcements']),
             'websocket': self._test_websocket
         }
         
+        # Os testes rodam em paralelo (disco e socket se sobrepõem); falhas são logadas
+        # assim que terminam, mas os resultados seguem a ordem de features
+        outcomes = {}
+        with ThreadPoolExecutor(max_workers=len(features)) as executor:
+            futures = {executor.submit(test_function): name for name, test_function in features.items()}
+            for future in as_completed(futures):
+                feature_name = futures[future]
+                try:
+                    outcomes[feature_name] = (future.result(), None)
+                except Exception as e:
+                    outcomes[feature_name] = (None, e)
+                    self.logger.error("Erro ao testar %s: %s", feature_name, e)
+                    continue
+                if outcomes[feature_name][0].get('status') != 'OK':
+                    self.logger.warning("Funcionalidade %s com problemas", feature_name)
+        
         feature_results = {}
         
-        for feature_name, test_function in features.items():
-            try:
-                result = test_function()
-                feature_results[feature_name] = result
-                if result.get('status') == 'OK':
-                    self.audit_results['success'].append(f"Funcionalidade {feature_name} está funcionando")
-                else:
-                    self.audit_results['errors'].append(f"Funcionalidade {feature_name} com problemas: {result.get('error', 'Unknown')}")
-            except Exception as e:
-                feature_results[feature_name] = {'status': 'ERROR', 'error': str(e)}
-                self.audit_results['errors'].append(f"Erro ao testar {feature_name}: {str(e)}")
+        for feature_name in features:
+            result, error = outcomes[feature_name]
+            if error is not None:
+                feature_results[feature_name] = {'status': 'ERROR', 'error': str(error)}
+                partial['errors'].append(f"Erro ao testar {feature_name}: {str(error)}")
+                continue
+            feature_results[feature_name] = result
+            if result.get('status') == 'OK':
+                partial['success'].append(f"Funcionalidade {feature_name} está funcionando")
+            else:
+                partial['errors'].append(f"Funcionalidade {feature_name} com problemas: {result.get('error', 'Unknown')}")
         
-        self.audit_results['system_status']['features'] = feature_results
+        partial['system_status']['features'] = feature_results
+        return partial
 
-    def _test_device_management(self):
-        """Testa gerenciamento de dispositivos"""
+    def _test_device_management(self, probe: Dict[str, Any]):
+        """Testa gerenciamento de dispositivos a partir do resultado da requisição"""
+        if 'error' in probe:
+            return {'status': 'ERROR', 'error': probe['error']}
+        response = probe['response']
+        if response.status_code != 200:
+            return {'status': 'ERROR', 'error': f'HTTP {response.status_code}'}
+        
         try:
-            url = f"{self.base_urls['api']}/devices"
-            response = requests.get(url, timeout=5)
-            
-            if response.status_code == 200:
-                devices = response.json()
-                return {
-                    'status': 'OK',
-                    'device_count': len(devices) if isinstance(devices, list) else 0
-                }
-            else:
-                return {'status': 'ERROR', 'error': f'HTTP {response.status_code}'}
-        except Exception as e:
-            return {'status': 'ERROR', 'error': str(e)}
+            devices = response.json()
+        except ValueError:
+            return {'status': 'ERROR', 'error': 'Invalid JSON response'}
+        return {
+            'status': 'OK',
+            'device_count': len(devices) if isinstance(devices, list) else 0
+        }
 
     def _test_file_upload(self):
         """Testa sistema de upload"""
@@ -323,154 +669,222 @@ class SystemAuditor:
         else:
             return {'status': 'ERROR', 'error': 'Upload directory not found'}
 
-    def _test_announcements(self):
-        """Testa sistema de anúncios"""
-        try:
-            url = f"{self.base_urls['api']}/announcements"
-            response = requests.get(url, timeout=5)
-            
-            if response.status_code == 200:
-                return {'status': 'OK'}
-            else:
-                return {'status': 'ERROR', 'error': f'HTTP {response.status_code}'}
-        except Exception as e:
-            return {'status': 'ERROR', 'error': str(e)}
+    def _test_announcements(self, probe: Dict[str, Any]):
+        """Testa sistema de anúncios a partir do resultado da requisição"""
+        if 'error' in probe:
+            return {'status': 'ERROR', 'error': probe['error']}
+        response = probe['response']
+        if response.status_code == 200:
+            return {'status': 'OK'}
+        else:
+            return {'status': 'ERROR', 'error': f'HTTP {response.status_code}'}
 
     def _test_websocket(self):
         """Testa conexão WebSocket"""
         # Teste básico - verificar se o servidor WebSocket está rodando
         try:
             # Tentar conectar na porta WebSocket (assumindo 3001)
-            import socket
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(2)
-            result = sock.connect_ex(('localhost', 3001))
+            sock = socket.create_connection(self._websocket_address(), timeout=2)
             sock.close()
-            
-            if result == 0:
-                return {'status': 'OK', 'websocket_port_open': True}
-            else:
-                return {'status': 'ERROR', 'error': 'WebSocket port not accessible'}
-        except Exception as e:
-            return {'status': 'ERROR', 'error': str(e)}
+        except OSError:
+            return {'status': 'ERROR', 'error': 'WebSocket port not accessible'}
+        return {'status': 'OK', 'websocket_port_open': True}
+
+    @classmethod
+    def _websocket_address(cls) -> Tuple[str, int]:
+        """Endereço de localhost:3001, resolvido só na primeira chamada"""
+        if cls._websocket_addr is None:
+            # Evita a consulta a /etc/hosts/nsswitch a cada teste
+            cls._websocket_addr = socket.getaddrinfo(
+                'localhost', WEBSOCKET_PORT, socket.AF_INET, socket.SOCK_STREAM
+            )[0][4]
+        return cls._websocket_addr
 
     def _audit_file_system(self):
         """Audita sistema de arquivos"""
-        self.logger.info("Auditando sistema de arquivos...")
+        if self._info_on:
+            self.logger.info("Auditando sistema de arquivos...")
+        partial = self._phase_results()
         
         file_tests = {}
+        previous_tests = self._previous.get('file_system_tests', {})
         
         # Verificar diretórios importantes
-        important_dirs = [
-            'backend/uploads',
-            'backend/config',
-            'backend/routes',
-            'src/components',
-            'src/services'
-        ]
-        
-        for dir_path in important_dirs:
+        for dir_path in IMPORTANT_DIRS:
             full_path = self.project_root / dir_path
-            if full_path.exists():
+            files_key = f'dir_{dir_path}_files'
+            mtime_key = f'dir_{dir_path}_mtime'
+            try:
+                mtime = full_path.stat().st_mtime_ns
+            except OSError:
+                mtime = file_count = None
+            else:
+                if previous_tests.get(mtime_key) == mtime and files_key in previous_tests:
+                    # Nenhuma entrada criada ou removida desde o relatório anterior
+                    file_count = previous_tests[files_key]
+                else:
+                    # Contar arquivos no diretório: a listagem direta dispensa um Path
+                    # por entrada. Todas as entradas contam, inclusive ocultas (.gitkeep)
+                    try:
+                        with os.scandir(full_path) as it:
+                            file_count = sum(1 for _ in it)
+                    except OSError:
+                        file_count = None
+            
+            if file_count is not None:
                 file_tests[f'dir_{dir_path}'] = 'EXISTS'
-                # Contar arquivos no diretório
-                file_count = len(list(full_path.glob('*')))
-                file_tests[f'dir_{dir_path}_files'] = file_count
-                self.audit_results['success'].append(f"Diretório {dir_path} existe com {file_count} arquivos")
+                file_tests[files_key] = file_count
+                file_tests[mtime_key] = mtime
+                partial['success'].append(f"Diretório {dir_path} existe com {file_count} arquivos")
             else:
                 file_tests[f'dir_{dir_path}'] = 'MISSING'
-                self.audit_results['errors'].append(f"Diretório {dir_path} não encontrado")
+                partial['errors'].append(f"Diretório {dir_path} não encontrado")
         
-        self.audit_results['file_system_tests'] = file_tests
+        partial['file_system_tests'] = file_tests
+        return partial
 
     def _generate_audit_report(self):
         """Gera relatório de auditoria"""
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = datetime.datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         report_file = self.project_root / f"system_audit_report_{timestamp}.txt"
-        
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write("=" * 80 + "\n")
-            f.write("RELATÓRIO DE AUDITORIA DO SISTEMA - TVBOX3\n")
-            f.write("=" * 80 + "\n")
-            f.write(f"Data/Hora: {datetime.datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
-            f.write(f"Projeto: {self.project_root}\n\n")
-            
-            # Resumo executivo
-            f.write("RESUMO EXECUTIVO\n")
-            f.write("-" * 40 + "\n")
-            f.write(f"Total de sucessos: {len(self.audit_results['success'])}\n")
-            f.write(f"Total de erros: {len(self.audit_results['errors'])}\n")
-            f.write(f"Total de avisos: {len(self.audit_results['warnings'])}\n\n")
-            
-            # Status dos serviços
-            f.write("STATUS DOS SERVIÇOS\n")
-            f.write("-" * 40 + "\n")
-            for service, status in self.audit_results['service_tests'].items():
-                f.write(f"{service}: {status}\n")
-            f.write("\n")
-            
-            # Testes de login
-            f.write("TESTES DE LOGIN\n")
-            f.write("-" * 40 + "\n")
-            for test, result in self.audit_results['login_tests'].items():
-                f.write(f"{test}: {result.get('description', 'N/A')} - Status: {result.get('status_code', 'N/A')}\n")
-            f.write("\n")
-            
-            # Testes de API
-            f.write("TESTES DE API\n")
-            f.write("-" * 40 + "\n")
-            for test, result in self.audit_results['api_tests'].items():
-                f.write(f"{test}: {result.get('description', 'N/A')} - Status: {result.get('status_code', 'N/A')}\n")
-            f.write("\n")
-            
-            # Banco de dados
-            f.write("TESTES DE BANCO DE DADOS\n")
-            f.write("-" * 40 + "\n")
-            for test, result in self.audit_results['database_tests'].items():
-                f.write(f"{test}: {result}\n")
-            f.write("\n")
-            
-            # Erros encontrados
-            f.write("ERROS ENCONTRADOS\n")
-            f.write("-" * 40 + "\n")
-            if self.audit_results['errors']:
-                for i, error in enumerate(self.audit_results['errors'], 1):
-                    f.write(f"{i}. {error}\n")
-            else:
-                f.write("Nenhum erro crítico encontrado!\n")
-            f.write("\n")
-            
-            # Avisos
-            f.write("AVISOS\n")
-            f.write("-" * 40 + "\n")
-            if self.audit_results['warnings']:
-                for i, warning in enumerate(self.audit_results['warnings'], 1):
-                    f.write(f"{i}. {warning}\n")
-            else:
-                f.write("Nenhum aviso!\n")
-            f.write("\n")
-            
-            # Sucessos
-            f.write("TESTES BEM-SUCEDIDOS\n")
-            f.write("-" * 40 + "\n")
-            for success in self.audit_results['success']:
-                f.write(f"✓ {success}\n")
-        
         # Salvar também em JSON para processamento posterior
         json_file = self.project_root / f"system_audit_report_{timestamp}.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(self.audit_results, f, indent=2, ensure_ascii=False)
         
-        self.logger.info(f"Relatório de auditoria gerado: {report_file}")
-        self.logger.info(f"Dados JSON salvos em: {json_file}")
+        # Os dois arquivos já saem prontos em bytes: uma escrita por arquivo
+        text_payload, json_payload = self._serialize_results(now)
+        report_file.write_bytes(text_payload)
+        json_file.write_bytes(json_payload)
+        
+        if self._info_on:
+            self.logger.info("Relatório de auditoria gerado: %s", report_file)
+            self.logger.info("Dados JSON salvos em: %s", json_file)
         
         return report_file, json_file
 
+    def _serialize_results(self, now: datetime.datetime) -> Tuple[bytes, bytes]:
+        """Serializa audit_results como relatório de texto e como JSON, em UTF-8"""
+        parts: List[str] = []
+        ap = parts.append
+        ap("=" * 80 + "\n")
+        ap("RELATÓRIO DE AUDITORIA DO SISTEMA - TVBOX3\n")
+        ap("=" * 80 + "\n")
+        ap(f"Data/Hora: {now.strftime('%d/%m/%Y %H:%M:%S')}\n")
+        ap(f"Projeto: {self.project_root}\n\n")
+        
+        # Resumo executivo
+        ap("RESUMO EXECUTIVO\n")
+        ap("-" * 40 + "\n")
+        ap(f"Total de sucessos: {len(self.audit_results['success'])}\n")
+        ap(f"Total de erros: {len(self.audit_results['errors'])}\n")
+        ap(f"Total de avisos: {len(self.audit_results['warnings'])}\n\n")
+        
+        # Status dos serviços
+        ap("STATUS DOS SERVIÇOS\n")
+        ap("-" * 40 + "\n")
+        for service, status in self.audit_results['service_tests'].items():
+            ap(f"{service}: {status}\n")
+        ap("\n")
+        
+        # Testes de login
+        ap("TESTES DE LOGIN\n")
+        ap("-" * 40 + "\n")
+        for test, result in self.audit_results['login_tests'].items():
+            ap(f"{test}: {result.get('description', 'N/A')} - Status: {result.get('status_code', 'N/A')}\n")
+        ap("\n")
+        
+        # Testes de API
+        ap("TESTES DE API\n")
+        ap("-" * 40 + "\n")
+        for test, result in self.audit_results['api_tests'].items():
+            ap(f"{test}: {result.get('description', 'N/A')} - Status: {result.get('status_code', 'N/A')}\n")
+        ap("\n")
+        
+        # Requisições mais lentas
+        ap("REQUISIÇÕES MAIS LENTAS\n")
+        ap("-" * 40 + "\n")
+        slowest = self._probe_log.execute(
+            "SELECT method, url, status, elapsed FROM probes"
+            " WHERE elapsed IS NOT NULL ORDER BY elapsed DESC LIMIT ?",
+            (SLOWEST_PROBES,)
+        ).fetchall()
+        if slowest:
+            parts.extend(
+                f"{elapsed:.3f}s {method} {url} - Status: {status}\n"
+                for method, url, status, elapsed in slowest
+            )
+        else:
+            ap("Nenhuma requisição respondida\n")
+        ap("\n")
+        
+        # Banco de dados
+        ap("TESTES DE BANCO DE DADOS\n")
+        ap("-" * 40 + "\n")
+        for test, result in self.audit_results['database_tests'].items():
+            ap(f"{test}: {result}\n")
+        ap("\n")
+        
+        # Erros encontrados
+        ap("ERROS ENCONTRADOS\n")
+        ap("-" * 40 + "\n")
+        if self.audit_results['errors']:
+            parts.extend(f"{i}. {error}\n" for i, error in enumerate(self.audit_results['errors'], 1))
+        else:
+            ap("Nenhum erro crítico encontrado!\n")
+        ap("\n")
+        
+        # Avisos
+        ap("AVISOS\n")
+        ap("-" * 40 + "\n")
+        if self.audit_results['warnings']:
+            parts.extend(f"{i}. {warning}\n" for i, warning in enumerate(self.audit_results['warnings'], 1))
+        else:
+            ap("Nenhum aviso!\n")
+        ap("\n")
+        
+        # Sucessos
+        ap("TESTES BEM-SUCEDIDOS\n")
+        ap("-" * 40 + "\n")
+        # Lista que mais cresce (uma entrada por verificação bem-sucedida): extend
+        # com um gerador em vez de uma chamada de append por linha
+        parts.extend(f"✓ {success}\n" for success in self.audit_results['success'])
+        
+        # Relatório montado em memória e codificado de uma só vez
+        text_payload = ''.join(parts).encode('utf-8')
+        
+        # JSON compacto por padrão, indentado só com --pretty
+        if orjson is not None:
+            # orjson já gera UTF-8 sem escapar acentos, como ensure_ascii=False
+            option = orjson.OPT_INDENT_2 if self.pretty else 0
+            json_payload = orjson.dumps(self.audit_results, option=option)
+        elif self.pretty:
+            json_payload = json.dumps(self.audit_results, indent=2, ensure_ascii=False).encode('utf-8')
+        else:
+            json_payload = json.dumps(self.audit_results, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        
+        return text_payload, json_payload
+
 def main():
     """Função principal"""
+    parser = argparse.ArgumentParser(description="Auditor de sistema do TVBOX3")
+    parser.add_argument('--pretty', action='store_true',
+                        help="grava o relatório JSON indentado")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="lista todos os arquivos e diretórios, ignorando o relatório anterior")
+    args = parser.parse_args()
+    
+    # Configurar logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    
     project_root = os.path.dirname(os.path.abspath(__file__))
-    auditor = SystemAuditor(project_root)
-    auditor.run_full_audit()
+    auditor = SystemAuditor(project_root, pretty=args.pretty, use_cache=not args.no_cache)
+    try:
+        auditor.run_full_audit()
+    finally:
+        auditor.close()
     
     print("\n" + "=" * 60)
     print("AUDITORIA DO SISTEMA CONCLUÍDA!")